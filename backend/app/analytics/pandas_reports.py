@@ -4,38 +4,141 @@ Pandas crawl analytics helpers.
 Pro Tip:
 Keep analytics separate from ingestion pipeline.
 Pipelines should be deterministic — analytics can be exploratory.
+
+For plain counts use app.analytics.sql_reports — it aggregates in the
+database. Load a DataFrame only when you really need row-level data.
 """
 
 from __future__ import annotations
 
+from typing import Any, Iterator, Optional
+
 import pandas as pd
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.crawl import CrawlRecord
 
+RECORD_COLUMNS = ("id", "source", "title", "url", "tags", "fetched_at")
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def _record_chunks(db: Session, chunk_size: int, since_id: Optional[int]) -> Iterator[list[tuple]]:
+    stmt = select(*(getattr(CrawlRecord, c) for c in RECORD_COLUMNS)).order_by(CrawlRecord.id)
+    if since_id is not None:
+        stmt = stmt.where(CrawlRecord.id > since_id)
 
-def records_to_dataframe(db: Session) -> pd.DataFrame:
-    rows = db.query(CrawlRecord).all()
+    # yield_per streams from a server-side cursor where the driver supports it
+    result = db.execute(stmt.execution_options(yield_per=chunk_size))
+    for partition in result.partitions():
+        yield [tuple(row) for row in partition]
 
-    data = [
+
+def _chunk_to_frame(rows: list[tuple]) -> pd.DataFrame:
+    columns = list(zip(*rows))
+    return pd.DataFrame(
         {
-            "id": r.id,
-            "source": r.source,
-            "title": r.title,
-            "url": r.url,
-            "tags": r.tags,
-            "fetched_at": r.fetched_at,
+            "id": pd.array(columns[0], dtype="int64"),
+            "source": pd.Categorical(columns[1]),
+            "title": pd.array(columns[2], dtype="string"),
+            "url": pd.array(columns[3], dtype="string"),
+            "tags": pd.array(columns[4], dtype="string"),
+            "fetched_at": pd.to_datetime(pd.Series(columns[5]), utc=True, format="ISO8601", errors="coerce"),
         }
-        for r in rows
-    ]
+    )
+
+
+def _empty_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id": pd.array([], dtype="int64"),
+            "source": pd.Categorical([]),
+            "title": pd.array([], dtype="string"),
+            "url": pd.array([], dtype="string"),
+            "tags": pd.array([], dtype="string"),
+            "fetched_at": pd.Series([], dtype="datetime64[ns, UTC]"),
+        }
+    )
+
+
+def records_to_dataframe(
+    db: Session,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    since_id: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Load crawl_records column-wise in chunks (no ORM objects, no per-row dicts).
+    `fetched_at` is parsed to tz-aware datetimes and `source` is categorical.
+    """
+    frames = [_chunk_to_frame(rows) for rows in _record_chunks(db, chunk_size, since_id) if rows]
+    if not frames:
+        return _empty_frame()
+    if len(frames) == 1:
+        return frames[0]
+
+    df = pd.concat(frames, ignore_index=True)
+    # concat of differing categoricals falls back to object; restore it
+    df["source"] = df["source"].astype("category")
+    return df
+
+
+def records_to_arrow(
+    db: Session,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    since_id: Optional[int] = None,
+) -> Any:
+    """
+    Same data as records_to_dataframe, as a pyarrow.Table built from record batches.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError as e:
+        raise RuntimeError("pyarrow not installed. Install with: pip install '.[analytics]'") from e
+
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("source", pa.dictionary(pa.int32(), pa.string())),
+            ("title", pa.string()),
+            ("url", pa.string()),
+            ("tags", pa.string()),
+            ("fetched_at", pa.string()),
+        ]
+    )
+
+    batches = []
+    for rows in _record_chunks(db, chunk_size, since_id):
+        if not rows:
+            continue
+        columns = list(zip(*rows))
+        batches.append(
+            pa.record_batch(
+                [
+                    pa.array(columns[0], pa.int64()),
+                    pa.array(columns[1], pa.string()).dictionary_encode(),
+                    pa.array(columns[2], pa.string()),
+                    pa.array(columns[3], pa.string()),
+                    pa.array(columns[4], pa.string()),
+                    pa.array(columns[5], pa.string()),
+                ],
+                schema=schema,
+            )
+        )
 
-    return pd.DataFrame(data)
+    table = pa.Table.from_batches(batches, schema=schema)
+    # ISO strings -> timestamps in one vectorised pass
+    fetched_at = pc.cast(table["fetched_at"], pa.timestamp("us", tz="UTC"))
+    return table.set_column(table.schema.get_field_index("fetched_at"), "fetched_at", fetched_at)
 
 
 def count_by_source(df: pd.DataFrame) -> pd.Series:
-    return df.groupby("source").size().sort_values(ascending=False)
+    return df.groupby("source", observed=True).size().sort_values(ascending=False)
 
 
 def recent_activity(df: pd.DataFrame, hours: int = 24) -> pd.DataFrame:
-    cutoff = pd.Timestamp.utcnow() - pd.Timedelta(hours=hours)
-    return df[df["fetched_at"] >= cutoff]
\ No newline at end of file
+    cutoff = pd.Timestamp.now(tz="UTC") - pd.Timedelta(hours=hours)
+    return df[df["fetched_at"] >= cutoff]
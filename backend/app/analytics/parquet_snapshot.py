@@ -0,0 +1,331 @@
+"""
+Incremental, partitioned Parquet snapshots of crawl_records and crawl_requests
+for offline analytics (pandas, DuckDB, Spark, ...).
+
+Layout under PARQUET_EXPORT_DIR (hive partitioning):
+
+    crawl_records/date=2024-01-01/source=arxiv/part-1-5000-0.parquet
+    crawl_requests/date=2024-01-01/host=arxiv.org/part-1-9000-0.parquet
+    _watermarks.json
+
+Each export streams the rows above the table's watermark (by id) from a
+server-side cursor straight into Parquet row groups, so memory stays flat
+however large the backlog is. The id range is recorded as "pending" before
+any file is written; a crashed export is retried over the same range with
+the same file names, so re-runs overwrite instead of duplicating.
+
+Only rows inserted more than PARQUET_EXPORT_LAG_SECONDS ago (inserted_at,
+set by the database) are exported: with concurrent writers, Postgres can
+commit a lower id after a higher one, and a row still in flight when the
+watermark passes its id would never be exported. The guard holds as long as
+no write transaction stays open longer than the lag.
+
+Rows are exported as they are when first seen: later merges into an
+existing record (tags, fetched_at) are not re-exported. Run with --full to
+rebuild everything from scratch.
+
+Pro Tip:
+Read snapshots through `load_records` / `snapshot_dataset` with filters —
+they prune whole date/source directories before touching a file, and
+Parquet column statistics skip row groups inside the ones that remain.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional, Sequence, Union
+
+from sqlalchemy import Integer, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.crawl import CrawlRecord, CrawlRequestLog
+
+WATERMARK_FILE = "_watermarks.json"
+DEFAULT_ROW_GROUP_SIZE = 50_000
+DEFAULT_LAG_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class SnapshotTable:
+    model: Any
+    columns: tuple[str, ...]
+    time_column: str  # ISO string column: parsed to a timestamp and its date is the first partition key
+    partition_column: str
+
+
+SNAPSHOT_TABLES: dict[str, SnapshotTable] = {
+    "crawl_records": SnapshotTable(
+        model=CrawlRecord,
+        columns=("id", "source", "title", "url", "tags", "content_hash", "fetched_at", "created_at"),
+        time_column="fetched_at",
+        partition_column="source",
+    ),
+    "crawl_requests": SnapshotTable(
+        model=CrawlRequestLog,
+        columns=(
+            "id",
+            "job_id",
+            "run_id",
+            "method",
+            "url",
+            "host",
+            "robots_allowed",
+            "status_code",
+            "duration_ms",
+            "error_type",
+            "error_message",
+            "attempts",
+            "breaker_state",
+            "created_at",
+        ),
+        time_column="created_at",
+        partition_column="host",
+    ),
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise RuntimeError("pyarrow not installed. Install with: pip install '.[analytics]'") from e
+    return pa, pc, ds
+
+
+def _partitioning(spec: SnapshotTable) -> Any:
+    pa, _, ds = _pyarrow()
+    return ds.partitioning(pa.schema([("date", pa.string()), (spec.partition_column, pa.string())]), flavor="hive")
+
+
+def _schema(spec: SnapshotTable) -> Any:
+    pa, _, _ = _pyarrow()
+    fields = []
+    for name in spec.columns:
+        if name == spec.time_column:
+            fields.append((name, pa.timestamp("us", tz="UTC")))
+        elif isinstance(getattr(spec.model, name).type, Integer):
+            fields.append((name, pa.int64()))
+        else:
+            fields.append((name, pa.string()))
+    return pa.schema([*fields, ("date", pa.string())])
+
+
+def _batches(
+    db: Session, spec: SnapshotTable, schema: Any, *, low: int, high: int, row_group_size: int
+) -> Iterator[Any]:
+    pa, pc, _ = _pyarrow()
+    model = spec.model
+    stmt = (
+        select(*(getattr(model, c) for c in spec.columns))
+        .where(model.id > low, model.id <= high)
+        .order_by(model.id)
+    )
+    # yield_per streams from a server-side cursor where the driver supports it
+    result = db.execute(stmt.execution_options(yield_per=row_group_size))
+    for rows in result.partitions():
+        columns = dict(zip(spec.columns, zip(*rows)))
+        arrays = []
+        for field in schema:
+            if field.name == "date":
+                continue
+            if field.name == spec.time_column:
+                raw = pa.array(columns[field.name], pa.string())
+                # "" (never set) becomes null instead of failing the cast
+                raw = pc.if_else(pc.equal(raw, ""), pa.scalar(None, pa.string()), raw)
+                arrays.append(pc.cast(raw, field.type))
+            else:
+                arrays.append(pa.array(columns[field.name], field.type))
+        times = arrays[spec.columns.index(spec.time_column)]
+        date = pc.fill_null(pc.strftime(times, format="%Y-%m-%d"), "unknown")
+        yield pa.record_batch([*arrays, date], schema=schema)
+
+
+def _read_watermarks(root: Path) -> dict[str, dict]:
+    path = root / WATERMARK_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _write_watermarks(root: Path, marks: dict[str, dict]) -> None:
+    # temp file + rename: a crash never leaves a truncated watermark file
+    fd, tmp = tempfile.mkstemp(dir=root, prefix=".watermarks-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(marks, f, indent=2, sort_keys=True)
+    os.replace(tmp, root / WATERMARK_FILE)
+
+
+def export_table(
+    db: Session,
+    root: Union[str, Path],
+    table: str,
+    *,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    lag_seconds: float = DEFAULT_LAG_SECONDS,
+    now: Optional[datetime] = None,
+) -> dict:
+    """
+    Append the rows of `table` written since the last export, up to the newest row
+    inserted at least `lag_seconds` ago. Returns {"table", "from_id", "to_id", "rows"}.
+    """
+    _, _, ds = _pyarrow()
+    spec = SNAPSHOT_TABLES[table]
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+
+    marks = _read_watermarks(root)
+    mark = marks.get(table, {})
+    low = int(mark.get("through_id", 0))
+    high = mark.get("pending_through_id")
+    if high is None:
+        # a row inserted after the cutoff may still be committing alongside lower ids; stop below
+        # it and pick the range up next time (NULL: added before the column, or SQLite, see migrations)
+        cutoff = (now or datetime.now(timezone.utc)) - timedelta(seconds=lag_seconds)
+        inserted_at = spec.model.inserted_at
+        settled = select(func.max(spec.model.id)).where(
+            spec.model.id > low, or_(inserted_at.is_(None), inserted_at < cutoff)
+        )
+        high = int(db.scalar(settled) or low)
+    if high <= low:
+        return {"table": table, "from_id": low, "to_id": low, "rows": 0}
+
+    marks[table] = {**mark, "through_id": low, "pending_through_id": high}
+    _write_watermarks(root, marks)
+
+    schema = _schema(spec)
+    rows = 0
+
+    def counted() -> Iterator[Any]:
+        nonlocal rows
+        for batch in _batches(db, spec, schema, low=low, high=high, row_group_size=row_group_size):
+            rows += batch.num_rows
+            yield batch
+
+    ds.write_dataset(
+        counted(),
+        root / table,
+        schema=schema,
+        format="parquet",
+        partitioning=_partitioning(spec),
+        basename_template=f"part-{low + 1}-{high}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        max_rows_per_group=row_group_size,
+        # deterministic file names, so a retried range overwrites its own files
+        use_threads=False,
+    )
+
+    marks[table] = {
+        "through_id": high,
+        "pending_through_id": None,
+        "exported_at": datetime.now(timezone.utc).isoformat(),
+    }
+    _write_watermarks(root, marks)
+    return {"table": table, "from_id": low, "to_id": high, "rows": rows}
+
+
+def export_snapshots(
+    db: Session,
+    root: Union[str, Path],
+    *,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    lag_seconds: float = DEFAULT_LAG_SECONDS,
+    full: bool = False,
+) -> list[dict]:
+    """
+    Incrementally export every SNAPSHOT_TABLES entry. full=True deletes the snapshot first.
+    """
+    root = Path(root)
+    if full:
+        for table in SNAPSHOT_TABLES:
+            shutil.rmtree(root / table, ignore_errors=True)
+        (root / WATERMARK_FILE).unlink(missing_ok=True)
+    return [
+        export_table(db, root, table, row_group_size=row_group_size, lag_seconds=lag_seconds)
+        for table in SNAPSHOT_TABLES
+    ]
+
+
+def snapshot_dataset(root: Union[str, Path], table: str = "crawl_records") -> Any:
+    """
+    Lazy pyarrow.dataset over one exported table; nothing is read until it is scanned.
+    DuckDB can query it directly (`duckdb.sql("SELECT ... FROM dataset")`).
+    """
+    _, _, ds = _pyarrow()
+    spec = SNAPSHOT_TABLES[table]
+    return ds.dataset(Path(root) / table, format="parquet", partitioning=_partitioning(spec))
+
+
+def load_records(
+    root: Union[str, Path],
+    *,
+    sources: Optional[Sequence[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    columns: Optional[Sequence[str]] = None,
+    table: str = "crawl_records",
+) -> Any:
+    """
+    Read a snapshot into a pandas DataFrame, pushing the filters down into the scan:
+    `sources` (the table's partition column) and the since/until dates prune partition
+    directories, and the exact time bounds use Parquet row-group statistics.
+    """
+    pa, _, ds = _pyarrow()
+    spec = SNAPSHOT_TABLES[table]
+    time = ds.field(spec.time_column)
+    conditions = []
+    if sources:
+        conditions.append(ds.field(spec.partition_column).isin(list(sources)))
+    timestamp = pa.timestamp("us", tz="UTC")
+    if since is not None:
+        since = since.astimezone(timezone.utc)
+        conditions += [ds.field("date") >= since.strftime("%Y-%m-%d"), time >= pa.scalar(since, timestamp)]
+    if until is not None:
+        until = until.astimezone(timezone.utc)
+        conditions += [ds.field("date") <= until.strftime("%Y-%m-%d"), time < pa.scalar(until, timestamp)]
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    dataset = snapshot_dataset(root, table)
+    return dataset.to_table(columns=list(columns) if columns else None, filter=expression).to_pandas()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    from app.core.config import settings
+
+    parser = argparse.ArgumentParser(description="Export crawl_records / crawl_requests to partitioned Parquet.")
+    parser.add_argument("--dir", default=settings.parquet_export_dir)
+    parser.add_argument("--full", action="store_true", help="delete the existing snapshot and re-export everything")
+    parser.add_argument("--row-group-size", type=int, default=settings.parquet_row_group_size)
+    args = parser.parse_args(argv)
+
+    if not args.dir:
+        parser.error("no export directory: set PARQUET_EXPORT_DIR or pass --dir")
+
+    from app.core.logging import configure_logging
+    from app.db.session import SessionLocal
+
+    configure_logging()
+    with SessionLocal() as db:
+        for result in export_snapshots(
+            db,
+            args.dir,
+            row_group_size=args.row_group_size,
+            lag_seconds=settings.parquet_export_lag_seconds,
+            full=args.full,
+        ):
+            print(result)
+
+
+if __name__ == "__main__":
+    main()
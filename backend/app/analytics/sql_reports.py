@@ -0,0 +1,130 @@
+"""
+SQL-side crawl analytics.
+
+Aggregations run in the database against the `source_hourly_counts`
+rollup (maintained on every insert) instead of loading crawl_records
+into Python.
+
+Pro Tip:
+Push the GROUP BY to where the data lives.
+Shipping a million rows to pandas just to count them is the slow path.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.models.analytics import HostLatencyStat, JobRunStat, SourceHourlyCount
+from app.models.crawl import CrawlRecord
+from app.repositories.crawl_repo import hour_bucket
+
+
+def count_by_source(db: Session) -> dict[str, int]:
+    """
+    Total records per source, largest first.
+    """
+    total = func.sum(SourceHourlyCount.record_count)
+    rows = db.execute(
+        select(SourceHourlyCount.source, total).group_by(SourceHourlyCount.source).order_by(total.desc())
+    ).all()
+    return {source: int(count or 0) for source, count in rows}
+
+
+def records_per_bucket(
+    db: Session,
+    *,
+    since: Optional[datetime] = None,
+    source: Optional[str] = None,
+) -> list[dict]:
+    """
+    New records per source per UTC hour, oldest bucket first.
+    """
+    stmt = select(SourceHourlyCount.source, SourceHourlyCount.bucket, SourceHourlyCount.record_count)
+    if since is not None:
+        stmt = stmt.where(SourceHourlyCount.bucket >= hour_bucket(since.astimezone(timezone.utc).isoformat()))
+    if source:
+        stmt = stmt.where(SourceHourlyCount.source == source)
+    stmt = stmt.order_by(SourceHourlyCount.bucket, SourceHourlyCount.source)
+
+    return [{"source": s, "bucket": b, "count": int(c)} for s, b, c in db.execute(stmt).all()]
+
+
+def recent_activity(db: Session, hours: int = 24) -> dict[str, int]:
+    """
+    New records per source over the last `hours` hours (hour granularity).
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    out: dict[str, int] = {}
+    for row in records_per_bucket(db, since=since):
+        out[row["source"]] = out.get(row["source"], 0) + row["count"]
+    return out
+
+
+def host_latency(db: Session) -> list[dict]:
+    """
+    Per-host fetch latency percentiles from the host_latency_stats rollup, slowest p99 first.
+    """
+    rows = db.scalars(select(HostLatencyStat).order_by(HostLatencyStat.p99_ms.desc(), HostLatencyStat.host)).all()
+    return [
+        {
+            "host": r.host,
+            "window_hours": r.window_hours,
+            "samples": r.sample_count,
+            "errors": r.error_count,
+            "p50_ms": r.p50_ms,
+            "p90_ms": r.p90_ms,
+            "p99_ms": r.p99_ms,
+            "max_ms": r.max_ms,
+            "refreshed_at": r.refreshed_at,
+        }
+        for r in rows
+    ]
+
+
+def job_success_rates(db: Session) -> list[dict]:
+    """
+    Per-job outcome counts and success rate from the job_run_stats rollup.
+    success_rate only counts finished runs; None until a run finishes.
+    """
+    rows = db.scalars(select(JobRunStat).order_by(JobRunStat.job_id)).all()
+    out: list[dict] = []
+    for r in rows:
+        finished = r.succeeded + r.failed
+        out.append(
+            {
+                "job_id": r.job_id,
+                "total": r.total,
+                "succeeded": r.succeeded,
+                "failed": r.failed,
+                "in_progress": r.in_progress,
+                "success_rate": round(r.succeeded / finished, 4) if finished else None,
+                "last_finished_at": r.last_finished_at or None,
+                "refreshed_at": r.refreshed_at,
+            }
+        )
+    return out
+
+
+def rebuild_source_rollups(db: Session) -> int:
+    """
+    Recompute source_hourly_counts from crawl_records in one INSERT ... SELECT.
+    Use for backfills; normal operation keeps the rollup current on insert.
+    Returns the number of rollup rows written.
+    """
+    # created_at is the first-seen timestamp; fetched_at moves on every re-upsert
+    first_seen = func.coalesce(func.nullif(CrawlRecord.created_at, ""), CrawlRecord.fetched_at)
+    bucket = func.substr(first_seen, 1, 13).concat(literal(":00:00+00:00"))
+
+    db.execute(delete(SourceHourlyCount))
+    db.execute(
+        SourceHourlyCount.__table__.insert().from_select(
+            ["source", "bucket", "record_count"],
+            select(CrawlRecord.source, bucket, func.count(CrawlRecord.id)).group_by(CrawlRecord.source, bucket),
+        )
+    )
+    db.commit()
+    return int(db.scalar(select(func.count(SourceHourlyCount.id))) or 0)
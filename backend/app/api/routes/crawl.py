@@ -1,39 +1,117 @@
 from __future__ import annotations
 
+import base64
 from datetime import datetime, timezone
 from typing import Optional, Union
-import uuid
 
-from fastapi import APIRouter, BackgroundTasks, Depends
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import SessionLocal, get_db
-from app.models.crawl import CrawlRecord, JobRun
-from app.schemas.crawl import CrawlRecordOut
+from app.core.config import settings
+from app.db.async_session import get_async_db
+from app.db.session import SessionLocal
+from app.models.crawl import JobRun
+from app.repositories.async_crawl_repo import AsyncCrawlRepository
+from app.repositories.crawl_repo import JOBS_VERSION, RECORDS_VERSION, CrawlRepository
+from app.schemas.crawl import CrawlRecordOut, CrawlRecordSearchOut
+from app.services.profiling import profile_summary
+from app.services.response_cache import response_cache
 
 router = APIRouter(prefix="/crawl", tags=["crawl"])
 
 
+# Only used when VALIDATE_RESPONSES is on (tests / debugging); the hot path skips Pydantic.
+_records_adapter = TypeAdapter(list[CrawlRecordOut])
+
+
+def _record_dicts(rows) -> list[dict]:
+    out = [
+        {
+            "id": id_,
+            "source": source,
+            "title": title,
+            "url": url,
+            "tags": [t for t in tags.split(",") if t] if tags else [],
+            "fetched_at": fetched_at,
+            "content_hash": content_hash,
+        }
+        for id_, source, title, url, tags, fetched_at, content_hash, *_ in rows
+    ]
+    if settings.validate_responses:
+        _records_adapter.validate_python(out)
+    return out
+
+
+async def _load_records(
+    repo: AsyncCrawlRepository, limit: int, source: Optional[str], before_id: Optional[int]
+) -> list[dict]:
+    return _record_dicts(await repo.list_records(limit=limit, source=source, before_id=before_id))
+
+
+# response_model documents the shape; the handler returns pre-encoded bytes.
 @router.get("/records", response_model=list[CrawlRecordOut])
-def list_records(limit: int = 100, db: Session = Depends(get_db)):
+async def list_records(
+    request: Request,
+    limit: int = 100,
+    source: Optional[str] = None,
+    before_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
     limit = max(1, min(int(limit), 500))
-    rows = db.scalars(select(CrawlRecord).order_by(CrawlRecord.id.desc()).limit(limit)).all()
-
-    out: list[CrawlRecordOut] = []
-    for r in rows:
-        out.append(
-            CrawlRecordOut(
-                id=r.id,
-                source=r.source,
-                title=r.title,
-                url=r.url,
-                tags=[t for t in (r.tags or "").split(",") if t],
-                fetched_at=r.fetched_at,
-                content_hash=r.content_hash,
-            )
-        )
-    return out
+    repo = AsyncCrawlRepository(db)
+    return await response_cache.respond(
+        request,
+        name=RECORDS_VERSION,
+        params={"limit": limit, "source": source, "before_id": before_id},
+        version=lambda: repo.data_version(RECORDS_VERSION),
+        build=lambda: _load_records(repo, limit, source, before_id),
+    )
+
+
+def _encode_cursor(score: float, id_: int) -> str:
+    # repr() round-trips floats exactly, so the keyset comparison is stable
+    return base64.urlsafe_b64encode(f"{score!r}:{id_}".encode("ascii")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[float, int]:
+    try:
+        score, id_ = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("ascii").split(":")
+        return float(score), int(id_)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="invalid cursor") from None
+
+
+async def _search_records(
+    repo: AsyncCrawlRepository, q: str, limit: int, source: Optional[str], after: Optional[tuple[float, int]]
+) -> dict:
+    rows = await repo.search_records(query=q, limit=limit, source=source, after=after)
+    next_cursor = _encode_cursor(rows[-1].score, rows[-1].id) if len(rows) == limit else None
+    return {"items": _record_dicts(rows), "next_cursor": next_cursor}
+
+
+@router.get("/records/search", response_model=CrawlRecordSearchOut)
+async def search_records(
+    request: Request,
+    q: str,
+    limit: int = 50,
+    source: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Ranked full-text search over titles and tags; every word is a prefix match ("pyth asyn").
+    """
+    limit = max(1, min(int(limit), 200))
+    after = _decode_cursor(cursor) if cursor else None
+    repo = AsyncCrawlRepository(db)
+    return await response_cache.respond(
+        request,
+        name=RECORDS_VERSION,
+        params={"search": q, "limit": limit, "source": source, "cursor": cursor},
+        version=lambda: repo.data_version(RECORDS_VERSION),
+        build=lambda: _search_records(repo, q, limit, source, after),
+    )
 
 
 def _run_job_in_background(job_id: int) -> None:
@@ -45,6 +123,7 @@ def _run_job_in_background(job_id: int) -> None:
 
         job.status = "running"
         job.started_at = datetime.now(timezone.utc).isoformat()
+        CrawlRepository(db).job_changed(job)
         db.commit()
 
         from app.scheduler.jobs import run_crawl_sampler  # noqa: WPS433
@@ -58,32 +137,24 @@ def _run_job_in_background(job_id: int) -> None:
             job.message = f"{type(e).__name__}: {e}"
 
         job.finished_at = datetime.now(timezone.utc).isoformat()
+        CrawlRepository(db).job_changed(job)
         db.commit()
+        response_cache.forget_versions()
     finally:
         db.close()
 
 
 @router.post("/run")
-def run_crawl_now(background: BackgroundTasks):
-    db = SessionLocal()
-    try:
-        now = datetime.now(timezone.utc).isoformat()
-        job = JobRun(
-            job_id="manual_crawl",
-            run_id=uuid.uuid4().hex,
-            status="queued",
-            message="queued",
-            started_at=now,
-            finished_at="",
-        )
-        db.add(job)
-        db.commit()
-        db.refresh(job)
+async def run_crawl_now(background: BackgroundTasks, db: AsyncSession = Depends(get_async_db)):
+    now = datetime.now(timezone.utc).isoformat()
+    job = await AsyncCrawlRepository(db).create_manual_job(now=now)
+    response_cache.forget_versions()
 
-        background.add_task(_run_job_in_background, job.id)
-        return {"ok": True, "job_id": job.id}
-    finally:
-        db.close()
+    # sync function: Starlette runs it in the threadpool after the response is sent.
+    # Exception to CRAWL_SHARDING: this crawls every source from the API process, with its
+    # own robots / throttle / breaker state, so it can overlap a worker on the same host.
+    background.add_task(_run_job_in_background, job.id)
+    return {"ok": True, "job_id": job.id}
 
 
 def _iso(dt: Optional[Union[datetime, str]]) -> Optional[str]:
@@ -104,10 +175,8 @@ def _iso(dt: Optional[Union[datetime, str]]) -> Optional[str]:
     return dt.isoformat()
 
 
-@router.get("/jobs")
-def list_jobs(limit: int = 20, db: Session = Depends(get_db)):
-    limit = max(1, min(int(limit), 100))
-    rows = db.scalars(select(JobRun).order_by(JobRun.id.desc()).limit(limit)).all()
+async def _load_jobs(repo: AsyncCrawlRepository, limit: int) -> list[dict]:
+    rows = await repo.list_jobs(limit=limit)
 
     return [
         {
@@ -121,3 +190,34 @@ def list_jobs(limit: int = 20, db: Session = Depends(get_db)):
         }
         for r in rows
     ]
+
+
+@router.get("/jobs")
+async def list_jobs(request: Request, limit: int = 20, db: AsyncSession = Depends(get_async_db)):
+    limit = max(1, min(int(limit), 100))
+    repo = AsyncCrawlRepository(db)
+    return await response_cache.respond(
+        request,
+        name=JOBS_VERSION,
+        params={"limit": limit},
+        version=lambda: repo.data_version(JOBS_VERSION),
+        build=lambda: _load_jobs(repo, limit),
+    )
+
+
+@router.get("/runs/{run_id}/profile")
+async def run_profile(run_id: str, format: str = "folded", db: AsyncSession = Depends(get_async_db)):
+    """
+    Profile of a run captured with `python -m app.scheduler.runner --profile`.
+    format=folded (default): folded stacks for flamegraph.pl / speedscope; format=json: stage + memory summary.
+    """
+    row = await AsyncCrawlRepository(db).get_profile(run_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail="no profile for this run")
+    if format == "json":
+        return profile_summary(row)
+    return Response(
+        content=row.folded,
+        media_type="text/plain",
+        headers={"Content-Disposition": f'attachment; filename="{run_id}.folded"'},
+    )
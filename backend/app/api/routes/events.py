@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.services.events import broker, sse_format
+
+router = APIRouter(prefix="/crawl", tags=["events"])
+
+
+@router.get("/events")
+async def stream_events(request: Request, types: Optional[str] = None):
+    """
+    Server-sent events: `job` state changes and upserted `record`s.
+    `types=job,record` filters; a `lagged` event means this client fell behind and should refetch.
+    """
+    wanted = {t.strip() for t in types.split(",") if t.strip()} if types else None
+    sub = broker.subscribe(wanted)
+
+    async def body():
+        try:
+            yield b"retry: 3000\n\n"
+            async for item in broker.stream(sub, heartbeat_seconds=settings.events_heartbeat_seconds):
+                if await request.is_disconnected():
+                    break
+                yield b": ping\n\n" if item is None else sse_format(item)
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,7 +1,11 @@
 from fastapi import APIRouter
 from app.api.routes.health import router as health_router
 from app.api.routes.crawl import router as crawl_router
+from app.api.routes.events import router as events_router
+from app.api.routes.stats import router as stats_router
 
 api_router = APIRouter()
 api_router.include_router(health_router)
-api_router.include_router(crawl_router)
\ No newline at end of file
+api_router.include_router(crawl_router)
+api_router.include_router(events_router)
+api_router.include_router(stats_router)
\ No newline at end of file
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Hashable, Optional
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.analytics import sql_reports
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.async_session import get_async_db
+
+router = APIRouter(prefix="/crawl/stats", tags=["stats"])
+
+# Dashboards poll these; rollups only change on write / scheduler refresh anyway.
+_cache = TTLCache(ttl_seconds=settings.stats_cache_ttl_seconds)
+
+
+async def _cached(db: AsyncSession, key: Hashable, load: Callable[[Session], Any]) -> Any:
+    missing = object()
+    value = _cache.get(key, missing)
+    if value is missing:
+        # sql_reports is sync ORM code; run_sync executes it on the async connection
+        value = await db.run_sync(load)
+        _cache.set(key, value)
+    return value
+
+
+@router.get("/sources")
+async def source_stats(hours: int = 24, source: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    hours = max(1, min(int(hours), 24 * 30))
+
+    def load(sync_db: Session) -> dict:
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        return {
+            "hours": hours,
+            "totals": sql_reports.count_by_source(sync_db),
+            "buckets": sql_reports.records_per_bucket(sync_db, since=since, source=source),
+        }
+
+    return await _cached(db, ("sources", hours, source), load)
+
+
+@router.get("/hosts")
+async def host_stats(db: AsyncSession = Depends(get_async_db)):
+    return await _cached(db, ("hosts",), sql_reports.host_latency)
+
+
+@router.get("/jobs")
+async def job_stats(db: AsyncSession = Depends(get_async_db)):
+    return await _cached(db, ("jobs",), sql_reports.job_success_rates)
@@ -0,0 +1,111 @@
+"""
+Small cache backends shared by the API.
+
+TTLCache is the default in-process store. RedisCache speaks the same
+interface over any redis-py compatible client so several API processes
+can share entries; pass a stand-in client (or just use TTLCache) where
+Redis isn't available.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe in-process cache: entries expire `ttl_seconds` after they are set,
+    and the least recently used entry is evicted beyond `max_entries`.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = int(max_entries)
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RedisCache:
+    """
+    TTLCache-compatible cache over a Redis client for bytes values.
+    Keys are stringified and prefixed. Values are stored as-is (no pickle),
+    so a shared store can never make the API execute anything.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        *,
+        url: str = "",
+        client: Optional[Any] = None,
+        prefix: str = "autoforge:",
+    ):
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("redis not installed. Install with: pip install '.[cache]'") from e
+            client = redis.Redis.from_url(url)
+
+        self.ttl_seconds = float(ttl_seconds)
+        self.prefix = prefix
+        self._client = client
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.prefix}{key!r}"
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        raw = self._client.get(self._key(key))
+        return default if raw is None else raw
+
+    def set(self, key: Hashable, value: bytes) -> None:
+        self._client.set(self._key(key), value, ex=max(1, int(round(self.ttl_seconds))))
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=f"{self.prefix}*"):
+            self._client.delete(key)
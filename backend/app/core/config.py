@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,7 +7,47 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
     app_env: str = "dev"
     database_url: str
+    async_database_url: str = ""  # default: database_url with an async driver
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: float = 30.0
     log_level: str = "INFO"
+    validate_responses: bool = False  # re-validate fast-path JSON with Pydantic (tests / debugging)
+    response_cache_backend: str = "memory"  # "memory" | "redis"
+    response_cache_ttl_seconds: float = 60.0
+    response_cache_max_entries: int = 256
+    response_cache_version_ttl_seconds: float = 1.0
+    redis_url: str = "redis://localhost:6379/0"
+    events_queue_size: int = 100
+    events_heartbeat_seconds: float = 15.0
+    stats_cache_ttl_seconds: float = 10.0
+    stats_refresh_seconds: int = 60
+    stats_latency_window_hours: int = 24
+    dedup_title_similarity: float = 0.75  # min title Jaccard similarity (0-1]; 0 disables title matching
+    page_archive_dir: str = ""  # empty = do not archive fetched pages
+    page_archive_zstd_level: int = 6
+    fetch_max_attempts: int = 3
+    fetch_backoff_base_seconds: float = 0.5
+    fetch_backoff_max_seconds: float = 8.0
+    fetch_timeout_seconds: float = 15.0  # per attempt
+    crawl_run_budget_seconds: float = 300.0  # whole crawl cycle; 0 = unlimited
+    breaker_failure_rate: float = 0.5
+    breaker_min_samples: int = 4
+    breaker_window: int = 20
+    breaker_cooldown_seconds: float = 600.0
+    sources_file: str = ""  # default: app/sources.yaml
+    sources_reload_seconds: int = 30
+    profile_interval_ms: int = 5  # stack sampling interval for --profile runs
+    record_hash_algorithm: Literal["sha256", "blake2b", "xxh3"] = "sha256"  # xxh3 needs the fasthash extra
+    crawl_sharding: bool = False  # workers split hosts by consistent hash (worker_nodes heartbeats)
+    worker_node_id: str = ""  # default: <hostname>-<pid>
+    worker_heartbeat_seconds: int = 10
+    worker_node_ttl_seconds: float = 30.0  # a node missing heartbeats this long loses its hosts
+    shard_virtual_nodes: int = 64
+    parquet_export_dir: str = ""  # empty = no scheduled Parquet snapshots
+    parquet_export_interval_seconds: int = 3600
+    parquet_row_group_size: int = 50_000
+    parquet_export_lag_seconds: float = 60.0  # rows younger than this wait for the next export
     cors_allowed_origins: str = (
         "http://localhost:5173,http://127.0.0.1:5173,"
         "http://localhost:5174,http://127.0.0.1:5174"
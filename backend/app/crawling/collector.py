@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Optional
 from urllib.parse import urlparse
 import time
 import httpx
@@ -19,10 +20,12 @@ class FetchResult:
     duration_ms: int
     robots_allowed: bool
     text: str
+    attempts: int = 1
+    breaker_state: str = ""  # set by ResilientCollector
 
 
 class BaseCollector:
-    def fetch(self, url: str) -> FetchResult:
+    def fetch(self, url: str, *, timeout: Optional[float] = None) -> FetchResult:
         raise NotImplementedError
 
 
@@ -41,7 +44,7 @@ class HttpCollector(BaseCollector):
         self.timeout_seconds = timeout_seconds
         self._client = httpx.Client(timeout=timeout_seconds, follow_redirects=True)
 
-    def fetch(self, url: str) -> FetchResult:
+    def fetch(self, url: str, *, timeout: Optional[float] = None) -> FetchResult:
         self.throttle.wait(url)
 
         allowed = self.robots.can_fetch(url)
@@ -50,7 +53,11 @@ class HttpCollector(BaseCollector):
             raise CrawlBlockedByRobots(f"Blocked by robots.txt: {url}")
 
         start = time.perf_counter()
-        r = self._client.get(url, headers={"User-Agent": self.user_agent})
+        r = self._client.get(
+            url,
+            headers={"User-Agent": self.user_agent},
+            timeout=self.timeout_seconds if timeout is None else timeout,
+        )
         duration_ms = int((time.perf_counter() - start) * 1000)
 
         return FetchResult(
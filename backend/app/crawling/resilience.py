@@ -0,0 +1,268 @@
+"""
+Retry / backoff / circuit breaking around a collector.
+
+- Transient failures (timeouts, connection errors, 429, 5xx) are retried
+  with jittered exponential backoff ("full jitter": sleep a random amount
+  up to base * 2^attempt, capped).
+- A per-host circuit breaker watches the recent outcomes; once the failure
+  rate over the window crosses the threshold the host is skipped for a
+  cool-down, then a single trial request decides whether it closes again.
+- Every attempt is capped by a per-request timeout and by what is left of
+  the per-run budget, so one dead host can't eat a whole crawl cycle.
+
+Pro Tip:
+Never retry what can't succeed: robots.txt blocks and 4xx responses are
+returned / raised immediately and don't count against the host.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+import httpx
+
+from app.crawling.collector import BaseCollector, CrawlBlockedByRobots, FetchResult
+
+logger = logging.getLogger("crawl.resilience")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class FetchFailed(Exception):
+    """
+    Raised when a fetch gives up. `error_type` is the underlying error's class name,
+    or "HTTP<status>" (with `status_code` set) when retries ran out on a 5xx / 429.
+    """
+
+    def __init__(self, message: str, *, attempts: int, breaker_state: str, error_type: str, status_code: int = 0):
+        super().__init__(message)
+        self.attempts = attempts
+        self.breaker_state = breaker_state
+        self.error_type = error_type
+        self.status_code = status_code
+
+
+class CircuitOpen(FetchFailed):
+    pass
+
+
+class RunBudgetExhausted(FetchFailed):
+    pass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay_seconds: float = 0.5
+    max_delay_seconds: float = 8.0
+
+    def backoff(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        """
+        Full-jitter delay before retry number `attempt` (1-based).
+        """
+        return rng() * min(self.max_delay_seconds, self.base_delay_seconds * (2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """
+    Per-host breaker over a sliding window of the last `window` outcomes.
+    Shared across runs (and threads) so a dead host stays skipped between cycles.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_rate: float = 0.5,
+        min_samples: int = 4,
+        window: int = 20,
+        cooldown_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_rate = failure_rate
+        self.min_samples = min_samples
+        self.window = window
+        self.cooldown_seconds = cooldown_seconds
+        self.clock = clock
+        self._outcomes: dict[str, deque[bool]] = {}
+        self._opened_at: dict[str, float] = {}
+        self._trial_in_flight: set[str] = set()
+        self._lock = threading.Lock()
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            return self._state(host)
+
+    def _state(self, host: str) -> str:
+        opened = self._opened_at.get(host)
+        if opened is None:
+            return CLOSED
+        return OPEN if self.clock() - opened < self.cooldown_seconds else HALF_OPEN
+
+    def allow(self, host: str) -> bool:
+        """
+        Whether a request to `host` may go out now. In half-open state only one trial is let through.
+        """
+        with self._lock:
+            state = self._state(host)
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and host not in self._trial_in_flight:
+                self._trial_in_flight.add(host)
+                return True
+            return False
+
+    def release(self, host: str) -> None:
+        """
+        End a half-open trial without an outcome (e.g. robots.txt said no): the host
+        stays half-open and the next allow() lets another trial through.
+        """
+        with self._lock:
+            self._trial_in_flight.discard(host)
+
+    def record(self, host: str, ok: bool) -> None:
+        with self._lock:
+            if host in self._trial_in_flight:
+                self._trial_in_flight.discard(host)
+                if ok:
+                    self._opened_at.pop(host, None)
+                    self._outcomes.pop(host, None)
+                else:
+                    self._opened_at[host] = self.clock()
+                return
+
+            outcomes = self._outcomes.setdefault(host, deque(maxlen=self.window))
+            outcomes.append(ok)
+            failures = outcomes.count(False)
+            if len(outcomes) >= self.min_samples and failures / len(outcomes) >= self.failure_rate:
+                if host not in self._opened_at:
+                    logger.warning("breaker_open", extra={"host": host, "failures": failures, "samples": len(outcomes)})
+                self._opened_at[host] = self.clock()
+
+
+class ResilientCollector(BaseCollector):
+    """
+    Wraps another collector; its fetch() must accept a `timeout` keyword.
+    Create one per crawl run: the run budget starts counting at construction.
+    """
+
+    def __init__(
+        self,
+        inner: BaseCollector,
+        *,
+        breaker: CircuitBreaker,
+        policy: RetryPolicy = RetryPolicy(),
+        request_timeout_seconds: float = 15.0,
+        run_budget_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.inner = inner
+        self.breaker = breaker
+        self.policy = policy
+        self.request_timeout_seconds = request_timeout_seconds
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng
+        self._deadline = None if run_budget_seconds is None else clock() + run_budget_seconds
+
+    def _remaining(self) -> Optional[float]:
+        return None if self._deadline is None else self._deadline - self.clock()
+
+    def fetch(self, url: str, *, timeout: Optional[float] = None) -> FetchResult:
+        host = urlparse(url).netloc
+        remaining = self._remaining()
+        if remaining is not None and remaining <= 0:
+            raise RunBudgetExhausted(
+                f"Run budget exhausted before fetching {url}",
+                attempts=0,
+                breaker_state=self.breaker.state(host),
+                error_type="RunBudgetExhausted",
+            )
+        if not self.breaker.allow(host):
+            raise CircuitOpen(f"Circuit open for {host}", attempts=0, breaker_state=OPEN, error_type="CircuitOpen")
+
+        # every exit records an outcome or releases the slot, or a half-open host would
+        # never get another trial
+        settled = False
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                per_request = min(timeout or self.request_timeout_seconds, self.request_timeout_seconds)
+                remaining = self._remaining()
+                if remaining is not None:
+                    # retries only start when the backoff fits in the budget, so this stays > 0
+                    per_request = max(0.001, min(per_request, remaining))
+
+                try:
+                    result = self.inner.fetch(url, timeout=per_request)
+                except CrawlBlockedByRobots:
+                    # says nothing about the host's health
+                    self.breaker.release(host)
+                    settled = True
+                    raise
+                except httpx.TransportError as e:  # timeouts, connection / protocol errors
+                    error: Optional[Exception] = e
+                    result = None
+                except Exception:
+                    # not retryable (invalid URL, too many redirects, ...) but still a failed fetch
+                    self.breaker.record(host, ok=False)
+                    settled = True
+                    raise
+                else:
+                    error = None
+
+                retryable = error is not None or result.status_code in RETRYABLE_STATUS
+                if not retryable:
+                    self.breaker.record(host, ok=True)
+                    settled = True
+                    return replace(result, attempts=attempt, breaker_state=self.breaker.state(host))
+
+                delay = self.policy.backoff(attempt, self.rng)
+                remaining = self._remaining()
+                out_of_budget = remaining is not None and remaining <= delay
+                if attempt >= self.policy.max_attempts or out_of_budget:
+                    self.breaker.record(host, ok=False)
+                    settled = True
+                    state = self.breaker.state(host)
+                    if error is not None:
+                        raise FetchFailed(
+                            f"{type(error).__name__} after {attempt} attempt(s): {error}",
+                            attempts=attempt,
+                            breaker_state=state,
+                            error_type=type(error).__name__,
+                        ) from error
+                    # an error page is not content: fail the fetch instead of handing it to the extractor
+                    raise FetchFailed(
+                        f"HTTP {result.status_code} after {attempt} attempt(s): {url}",
+                        attempts=attempt,
+                        breaker_state=state,
+                        error_type=f"HTTP{result.status_code}",
+                        status_code=result.status_code,
+                    )
+
+                logger.info(
+                    "fetch_retry",
+                    extra={
+                        "url": url,
+                        "attempt": attempt,
+                        "delay_s": round(delay, 3),
+                        "error": type(error).__name__ if error else result.status_code,
+                    },
+                )
+                self.sleep(delay)
+        finally:
+            if not settled:
+                self.breaker.release(host)
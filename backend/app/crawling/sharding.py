@@ -0,0 +1,158 @@
+"""
+Host-affinity sharding across crawl workers.
+
+Throttle, robots.txt and circuit-breaker state live in each worker's
+memory, so politeness only holds if every host is crawled by exactly one
+process. With CRAWL_SHARDING on, each worker:
+
+- heartbeats into the worker_nodes table every WORKER_HEARTBEAT_SECONDS
+- builds a consistent-hash ring from the nodes seen within
+  WORKER_NODE_TTL_SECONDS (virtual nodes smooth out the slices)
+- only schedules the sources whose host hashes to itself
+
+When a worker joins, leaves (graceful shutdown deletes its row) or stops
+heartbeating, every node sees the new membership on its next heartbeat
+and re-syncs its jobs. Consistent hashing means only ~1/N of the hosts
+move, and a hand-over overlaps by at most one heartbeat interval.
+
+Exception: POST /crawl/run crawls every source from the API process with
+its own throttle / robots / breaker state, so a manual run can overlap a
+worker on the same host. Use it for debugging, not on a schedule.
+
+Pro Tip:
+Shard on the host, not the source: two sources on the same site must land
+on the same worker or they will share the site's rate limit blindly.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import logging
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.repositories.worker_repo import WorkerRepository
+
+logger = logging.getLogger("crawl.sharding")
+
+
+def shard_key(url: str) -> str:
+    """
+    Host a URL is sharded on: lowercased, without a leading "www." or port.
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def _point(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring: each node owns the arcs ending at its `vnodes` points.
+    """
+
+    def __init__(self, nodes: Iterable[str], *, vnodes: int = 64):
+        points = sorted((_point(f"{node}#{i}"), node) for node in set(nodes) for i in range(max(1, vnodes)))
+        self._points = [p for p, _ in points]
+        self._owners = [node for _, node in points]
+        self.nodes = frozenset(self._owners)
+
+    def owner(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        i = bisect.bisect(self._points, _point(key)) % len(self._points)
+        return self._owners[i]
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class ShardCoordinator:
+    """
+    One per worker process. Call heartbeat() periodically; owns(url) answers from
+    the ring built on the last heartbeat (no database access).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        node_id: Optional[str] = None,
+        vnodes: int = 64,
+        ttl_seconds: float = 30.0,
+        now: Callable[[], datetime] = lambda: datetime.now(timezone.utc),
+    ):
+        self.session_factory = session_factory
+        self.node_id = node_id or default_node_id()
+        self.vnodes = vnodes
+        self.ttl_seconds = ttl_seconds
+        self._now = now
+        self._ring = HashRing((), vnodes=vnodes)
+
+    @property
+    def members(self) -> frozenset[str]:
+        return self._ring.nodes
+
+    def heartbeat(self) -> bool:
+        """
+        Record this node as alive and refresh membership (dead nodes are pruned).
+        Returns True when membership changed, i.e. host ownership was rebalanced.
+        """
+        now = self._now()
+        since = (now - timedelta(seconds=self.ttl_seconds)).isoformat()
+        with self.session_factory() as db:
+            repo = WorkerRepository(db)
+            repo.heartbeat(node_id=self.node_id, hostname=socket.gethostname(), pid=os.getpid(), now=now.isoformat())
+            repo.prune(before=since, keep=self.node_id)
+            nodes = set(repo.live_node_ids(since=since)) | {self.node_id}
+
+        if nodes == self._ring.nodes:
+            return False
+        previous = sorted(self._ring.nodes)
+        self._ring = HashRing(nodes, vnodes=self.vnodes)
+        logger.info("shard_rebalanced", extra={"node_id": self.node_id, "members": sorted(nodes), "previous": previous})
+        return True
+
+    def owns(self, url: str) -> bool:
+        return self.owns_key(shard_key(url))
+
+    def owns_key(self, key: str) -> bool:
+        """
+        Whether this node owns an arbitrary key (e.g. a cluster-wide singleton job).
+        """
+        return self._ring.owner(key) == self.node_id
+
+    def leave(self) -> None:
+        """
+        Drop this node from worker_nodes so the others take over its hosts immediately.
+        """
+        with self.session_factory() as db:
+            WorkerRepository(db).remove(self.node_id)
+        self._ring = HashRing((), vnodes=self.vnodes)
+        logger.info("shard_left", extra={"node_id": self.node_id})
+
+
+def build_shard_coordinator() -> Optional[ShardCoordinator]:
+    """
+    ShardCoordinator from settings, or None when CRAWL_SHARDING is off (every worker crawls every source).
+    """
+    if not settings.crawl_sharding:
+        return None
+    from app.db.session import SessionLocal
+
+    return ShardCoordinator(
+        SessionLocal,
+        node_id=settings.worker_node_id or None,
+        vnodes=settings.shard_virtual_nodes,
+        ttl_seconds=settings.worker_node_ttl_seconds,
+    )
@@ -1,3 +1,4 @@
+import threading
 import time
 from urllib.parse import urlparse
 
@@ -5,19 +6,20 @@ from urllib.parse import urlparse
 class HostThrottle:
     """
     Simple per-host throttle: minimum delay between requests to same host.
+    Thread-safe: concurrent callers each reserve their own slot.
     """
 
     def __init__(self, min_delay_seconds: float = 1.0):
         self.min_delay_seconds = float(min_delay_seconds)
         self._last_request: dict[str, float] = {}
+        self._lock = threading.Lock()
 
     def wait(self, url: str) -> None:
         host = urlparse(url).netloc
-        now = time.time()
-        last = self._last_request.get(host, 0.0)
-        elapsed = now - last
+        with self._lock:
+            now = time.time()
+            slot = max(now, self._last_request.get(host, 0.0) + self.min_delay_seconds)
+            self._last_request[host] = slot
 
-        if elapsed < self.min_delay_seconds:
-            time.sleep(self.min_delay_seconds - elapsed)
-
-        self._last_request[host] = time.time()
+        if slot > now:
+            time.sleep(slot - now)
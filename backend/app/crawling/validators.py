@@ -0,0 +1,118 @@
+"""
+Pure normalization helpers used before records are hashed and stored.
+
+Pro Tip:
+Validators should never fetch data — only transform or reject.
+Canonicalize BEFORE hashing, otherwise `?utm_source=x` and a trailing
+slash each become a "new" record.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_WS_RE = re.compile(r"\s+")
+
+# Query parameters that never change which document a URL points at.
+TRACKING_PARAMS = frozenset(
+    {
+        "fbclid",
+        "gclid",
+        "dclid",
+        "msclkid",
+        "mc_cid",
+        "mc_eid",
+        "igshid",
+        "ref",
+        "ref_src",
+        "ref_url",
+        "_hsenc",
+        "_hsmi",
+    }
+)
+TRACKING_PREFIXES = ("utm_",)
+
+
+@dataclass(frozen=True)
+class UrlRule:
+    """
+    Per-source canonicalization tweaks on top of the generic rules.
+
+    keep_params: if set, ONLY these query params survive (others are dropped).
+    drop_params: extra params to drop for this source.
+    path_rewrites: (pattern, replacement) regexes applied to the path in order.
+    """
+
+    keep_params: Optional[frozenset[str]] = None
+    drop_params: frozenset[str] = frozenset()
+    path_rewrites: tuple[tuple[re.Pattern, str], ...] = field(default_factory=tuple)
+
+
+SOURCE_URL_RULES: dict[str, UrlRule] = {
+    # /abs/2401.01234v3, /pdf/2401.01234v1.pdf -> /abs/2401.01234
+    "arxiv": UrlRule(
+        keep_params=frozenset(),
+        path_rewrites=((re.compile(r"^/(?:abs|pdf)/(.+?)(?:v\d+)?(?:\.pdf)?$"), r"/abs/\1"),),
+    ),
+    # HN item links are identified by ?id=; outbound article links keep their own params
+    "hackernews": UrlRule(drop_params=frozenset({"source", "via"})),
+    # docs pages never need a query string
+    "python_docs": UrlRule(keep_params=frozenset()),
+}
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_title(raw: str) -> str:
+    """
+    Collapse runs of whitespace and trim.
+    """
+    return _WS_RE.sub(" ", raw or "").strip()
+
+
+def canonicalize_url(url: str, source: Optional[str] = None) -> str:
+    """
+    Canonical form used for dedup and hashing:
+
+    - scheme forced to https, host lowercased, leading "www." and default ports dropped
+    - fragment removed, tracking params (utm_*, fbclid, ...) removed, remaining params sorted
+    - trailing slash removed (except for the root path)
+    - source-specific rules from SOURCE_URL_RULES applied last
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    if scheme not in ("http", "https"):
+        return url.strip()
+
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    try:
+        port = parts.port
+    except ValueError:
+        # e.g. "http://host:abc/" — not ours to fix; keep it as extracted
+        return url.strip()
+    netloc = host if port in (None, _DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+
+    rule = SOURCE_URL_RULES.get(source or "", UrlRule())
+
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    for pattern, replacement in rule.path_rewrites:
+        path = pattern.sub(replacement, path)
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+
+    params = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        lowered = key.lower()
+        if rule.keep_params is not None and key not in rule.keep_params:
+            continue
+        if lowered in TRACKING_PARAMS or lowered in rule.drop_params or lowered.startswith(TRACKING_PREFIXES):
+            continue
+        params.append((key, value))
+    query = urlencode(sorted(params))
+
+    return urlunsplit(("https", netloc, path, query, ""))
@@ -0,0 +1,39 @@
+"""
+Async engine for the API's read paths.
+
+Async handlers don't occupy a threadpool slot while waiting on the
+database, so one API process can hold many more concurrent dashboard /
+export requests than the sync `get_db` path allows.
+"""
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.db.session import pool_options
+
+# sync driver -> async driver for the same database
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg",
+    "postgresql+psycopg": "postgresql+psycopg",  # psycopg 3 is sync + async
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.drivername, url.drivername)
+    return url.set(drivername=driver).render_as_string(hide_password=False)
+
+
+_url = settings.async_database_url or async_url(settings.database_url)
+
+async_engine = create_async_engine(_url, pool_pre_ping=True, **pool_options(_url))
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,86 @@
+"""
+Schema setup, run once per deploy instead of on every API / worker boot:
+
+    python -m app.db.migrate
+
+Creates missing tables, applies the additive column migrations
+(app/db/migrations.py), installs the full-text search index and backfills
+derived tables that are new to an existing database (source rollups,
+dedup fingerprints).
+Every step is idempotent, so running it against an up-to-date database is
+a no-op.
+
+Pro Tip:
+Keep DDL out of process startup. An autoscaled API pod that runs
+create_all pays a round trip per table (and takes DDL locks) before it can
+serve its first request — and N pods booting together all do it at once.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.analytics.sql_reports import rebuild_source_rollups
+from app.db.base import Base
+from app.db.migrations import add_missing_columns
+from app.db.search import install_search_index
+
+# Import models so metadata is populated
+from app.models import analytics, archive, crawl, dedup, profiles, versions, workers  # noqa: F401
+from app.models.analytics import SourceHourlyCount
+from app.models.crawl import CrawlRecord
+from app.services.dedup import backfill_fingerprints
+
+logger = logging.getLogger("db.migrate")
+
+
+def migrate(bind: Optional[Engine] = None) -> list[str]:
+    """
+    Bring the database at `bind` (default: settings.database_url) up to the current models.
+    Returns "table.column" for each column added to an existing table.
+    """
+    if bind is None:
+        from app.db.session import engine as bind
+
+    Base.metadata.create_all(bind=bind)
+    # create_all skips existing tables, so older databases get new columns / the search index here
+    with bind.begin() as conn:
+        added = add_missing_columns(conn)
+        install_search_index(conn)
+    with Session(bind) as db:
+        backfill(db)
+    return added
+
+
+def backfill(db: Session) -> None:
+    """
+    Populate derived tables that were added after data already existed.
+    Each step checks first, so it only does work once.
+    """
+    has_records = db.scalar(select(CrawlRecord.id).limit(1)) is not None
+    if has_records and db.scalar(select(SourceHourlyCount.id).limit(1)) is None:
+        rows = rebuild_source_rollups(db)
+        logger.info("backfill_source_rollups", extra={"rows": rows})
+    # rows stored before dedup existed: without fingerprints, re-crawls whose canonical URL
+    # differs from the stored one would be inserted as new records instead of merged
+    if has_records:
+        indexed = backfill_fingerprints(db)
+        if indexed:
+            logger.info("backfill_fingerprints", extra={"rows": indexed})
+
+
+def main() -> None:
+    from app.core.logging import configure_logging
+
+    configure_logging()
+    added = migrate()
+    logger.info("migrate_done", extra={"tables": len(Base.metadata.tables), "columns_added": added})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Minimal additive schema migrations.
+
+`create_all` creates missing tables but never alters existing ones, so
+columns added to a model after a database was created are listed here and
+added with ALTER TABLE ... ADD COLUMN. Each step is idempotent: columns that
+already exist are skipped.
+
+Pro Tip:
+Only add nullable / defaulted columns here. Anything that rewrites or
+drops data deserves a real migration tool.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger("db.migrations")
+
+# (table, column, DDL type + default) — append only
+ADDED_COLUMNS: list[tuple[str, str, str]] = [
+    ("crawl_requests", "attempts", "INTEGER NOT NULL DEFAULT 1"),
+    ("crawl_requests", "breaker_state", "VARCHAR(16) NOT NULL DEFAULT ''"),
+    ("crawl_records", "inserted_at", "TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP"),
+    ("crawl_requests", "inserted_at", "TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP"),
+]
+
+# SQLite can't ADD COLUMN with a non-constant default: the column is added bare and
+# stays NULL there (fine for inserted_at: SQLite's single writer commits ids in order)
+SQLITE_DDL: dict[tuple[str, str], str] = {
+    ("crawl_records", "inserted_at"): "DATETIME",
+    ("crawl_requests", "inserted_at"): "DATETIME",
+}
+
+
+def add_missing_columns(connection: Connection) -> list[str]:
+    """
+    Add every ADDED_COLUMNS entry that is missing. Returns "table.column" for each one added.
+    """
+    inspector = inspect(connection)
+    sqlite = connection.dialect.name == "sqlite"
+    tables = set(inspector.get_table_names())
+    existing: dict[str, set[str]] = {}
+    added = []
+    for table, column, ddl in ADDED_COLUMNS:
+        if table not in tables:
+            continue  # create_all builds it with every column
+        if table not in existing:
+            existing[table] = {c["name"] for c in inspector.get_columns(table)}
+        if column in existing[table]:
+            continue
+        if sqlite:
+            ddl = SQLITE_DDL.get((table, column), ddl)
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        existing[table].add(column)
+        added.append(f"{table}.{column}")
+        logger.info("column_added", extra={"table": table, "column": column})
+    return added
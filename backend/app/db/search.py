@@ -0,0 +1,86 @@
+"""
+Database-native full-text index over crawl_records (title + tags).
+
+- PostgreSQL: GIN index on a to_tsvector() expression. Postgres maintains
+  it on every INSERT/UPDATE, and queries hit it as long as they use the
+  exact same expression (SEARCH_DOCUMENT_PG).
+- SQLite: external-content FTS5 table kept in sync by triggers, so
+  upserts through the repository update it in the same transaction.
+
+Installed after crawl_records is created (see app.models.crawl) and by
+app.db.migrate for databases that predate it; every statement is idempotent.
+
+Pro Tip:
+Never build the tsquery / MATCH string from raw user input — reduce it to
+plain word tokens first (search_terms), otherwise a stray quote or
+operator becomes a 500.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+FTS_TABLE = "crawl_records_fts"
+PG_INDEX = "ix_crawl_records_search"
+TS_CONFIG = "simple"  # no stemming: predictable prefix matches on titles/tags in any language
+SEARCH_DOCUMENT_PG = f"to_tsvector('{TS_CONFIG}', coalesce(title, '') || ' ' || coalesce(tags, ''))"
+MAX_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+_SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "title, tags, content='crawl_records', content_rowid='id', tokenize='unicode61')",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON crawl_records BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, tags) VALUES (new.id, new.title, new.tags);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON crawl_records BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, tags) VALUES ('delete', old.id, old.title, old.tags);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, tags ON crawl_records BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, tags) VALUES ('delete', old.id, old.title, old.tags);
+        INSERT INTO {FTS_TABLE}(rowid, title, tags) VALUES (new.id, new.title, new.tags);
+    END""",
+)
+
+
+def install_search_index(connection: Connection) -> None:
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        connection.execute(
+            text(f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON crawl_records USING gin ({SEARCH_DOCUMENT_PG})")
+        )
+    elif dialect == "sqlite":
+        existed = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+        ).first()
+        for ddl in _SQLITE_DDL:
+            connection.execute(text(ddl))
+        if not existed:
+            # index rows inserted before the table existed
+            connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def drop_search_index(connection: Connection) -> None:
+    # the Postgres index and SQLite triggers go away with crawl_records itself
+    if connection.dialect.name == "sqlite":
+        connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+
+def search_terms(query: str) -> list[str]:
+    return _TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def match_query(terms: list[str], dialect: str) -> Optional[str]:
+    """
+    AND of prefix matches in the dialect's query syntax; None if nothing to search for.
+    """
+    if not terms:
+        return None
+    if dialect == "postgresql":
+        return " & ".join(f"{t}:*" for t in terms)
+    return " AND ".join(f'"{t}"*' for t in terms)
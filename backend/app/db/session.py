@@ -1,8 +1,23 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+
+def pool_options(database_url: str) -> dict:
+    """
+    Pool sizing from settings; SQLite keeps SQLAlchemy's defaults.
+    """
+    if make_url(database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+    }
+
+
+engine = create_engine(settings.database_url, pool_pre_ping=True, **pool_options(settings.database_url))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 def get_db():
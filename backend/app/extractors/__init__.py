@@ -0,0 +1,23 @@
+from functools import lru_cache
+
+from app.extractors.arxiv import ArxivExtractor
+from app.extractors.base import BaseExtractor
+from app.extractors.hackernews import HackerNewsExtractor
+from app.extractors.wikipedia import WikipediaExtractor
+
+# extractor name (as used in the source registry) -> class
+EXTRACTORS: dict[str, type[BaseExtractor]] = {
+    "wikipedia": WikipediaExtractor,
+    "hackernews": HackerNewsExtractor,
+    "arxiv": ArxivExtractor,
+}
+
+
+@lru_cache(maxsize=128)
+def build_extractor(name: str, selectors: tuple[tuple[str, str], ...] = ()) -> BaseExtractor:
+    """
+    Shared extractor instance per (name, selector overrides), so selectors are
+    compiled once per process rather than on every crawl tick.
+    Extractors are stateless, which makes sharing them safe.
+    """
+    return EXTRACTORS[name](dict(selectors))
@@ -1,16 +1,18 @@
 from bs4 import BeautifulSoup
-from app.schemas.crawl import CrawlRecordIn
+from app.schemas.crawl import CrawlRecordIn, validate_records
 from app.extractors.base import BaseExtractor
 
 
 class ArxivExtractor(BaseExtractor):
+    default_selectors = {"entry": "dl > dt", "abs_link": 'a[href^="/abs/"]'}
+
     def extract(self, *, source: str, url: str, html: str) -> list[CrawlRecordIn]:
         soup = BeautifulSoup(html, "lxml")
-        items: list[CrawlRecordIn] = []
+        items: list[dict] = []
 
         # arXiv listings vary; keep MVP tolerant
-        for dt in soup.select("dl > dt"):
-            a = dt.select_one('a[href^="/abs/"]')
+        for dt in self.select("entry", soup):
+            a = self.select_one("abs_link", dt)
             if not a:
                 continue
             href = a.get("href") or ""
@@ -22,10 +24,11 @@ class ArxivExtractor(BaseExtractor):
                 title_text = t[:512] if t else ""
             if not title_text:
                 title_text = abs_url
-            items.append(CrawlRecordIn(source=source, title=title_text, url=abs_url, tags=["arxiv", "research"]))
+            items.append({"source": source, "title": title_text, "url": abs_url, "tags": ["arxiv", "research"]})
 
         if not items:
             page_title = soup.title.get_text(strip=True) if soup.title else "arXiv"
-            items.append(CrawlRecordIn(source=source, title=page_title, url=url, tags=["arxiv"]))
+            items.append({"source": source, "title": page_title, "url": url, "tags": ["arxiv"]})
 
-        return items
\ No newline at end of file
+        # validated together: one pydantic call and one timestamp per page
+        return validate_records(items)
\ No newline at end of file
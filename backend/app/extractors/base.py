@@ -1,6 +1,24 @@
+from typing import Any, Mapping, Optional
+
+import soupsieve as sv
+
 from app.schemas.crawl import CrawlRecordIn
 
 
 class BaseExtractor:
+    # name -> CSS selector; a source's registry entry can override any of them
+    default_selectors: Mapping[str, str] = {}
+
+    def __init__(self, selectors: Optional[Mapping[str, str]] = None):
+        merged = {**self.default_selectors, **(selectors or {})}
+        # compiled once per instance; instances are cached per source config (see app.extractors.build_extractor)
+        self.selectors = {name: sv.compile(pattern) for name, pattern in merged.items()}
+
+    def select(self, name: str, tag: Any) -> list:
+        return self.selectors[name].select(tag)
+
+    def select_one(self, name: str, tag: Any) -> Any:
+        return self.selectors[name].select_one(tag)
+
     def extract(self, *, source: str, url: str, html: str) -> list[CrawlRecordIn]:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
@@ -1,5 +1,5 @@
 from bs4 import BeautifulSoup
-from app.schemas.crawl import CrawlRecordIn
+from app.schemas.crawl import CrawlRecordIn, validate_records
 from app.extractors.base import BaseExtractor
 
 
@@ -7,11 +7,4 @@ class WikipediaExtractor(BaseExtractor):
     def extract(self, *, source: str, url: str, html: str) -> list[CrawlRecordIn]:
         soup = BeautifulSoup(html, "lxml")
         title = soup.title.get_text(strip=True) if soup.title else "Untitled"
-        return [
-            CrawlRecordIn(
-                source=source,
-                title=title,
-                url=url,
-                tags=["wikipedia", "education"],
-            )
-        ]
\ No newline at end of file
+        return validate_records([{"source": source, "title": title, "url": url, "tags": ["wikipedia", "education"]}])
\ No newline at end of file
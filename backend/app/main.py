@@ -3,14 +3,23 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.router import api_router
 from app.core.config import settings
-from app.db.init_db import init_db
+from app.services.events import start_listener
 
 app = FastAPI(title="Learning Lounge Automation Stack")
 
 
 @app.on_event("startup")
 def startup() -> None:
-    init_db()
+    # Schema is managed by `python -m app.db.migrate` (a separate deploy step), not on boot
+    # Postgres only: one LISTEN connection fans worker notifications out to /crawl/events
+    app.state.event_listener = start_listener(settings.database_url)
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    listener = getattr(app.state, "event_listener", None)
+    if listener is not None:
+        listener.stop()
 
 app.add_middleware(
     CORSMiddleware,
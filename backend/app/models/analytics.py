@@ -0,0 +1,58 @@
+from sqlalchemy import String, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class SourceHourlyCount(Base):
+    """
+    Rollup: number of new crawl_records per source per UTC hour.
+    Maintained incrementally by CrawlRepository.upsert_record.
+    """
+
+    __tablename__ = "source_hourly_counts"
+    __table_args__ = (UniqueConstraint("source", "bucket", name="uq_source_hourly_counts_source_bucket"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    source: Mapped[str] = mapped_column(String(64), index=True)
+    bucket: Mapped[str] = mapped_column(String(32), index=True)  # ISO hour, e.g. 2024-01-01T13:00:00+00:00
+    record_count: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class HostLatencyStat(Base):
+    """
+    Rollup: fetch latency percentiles per host over a trailing window of crawl_requests.
+    Recomputed by the scheduler (app.services.rollups.refresh_host_latency).
+    """
+
+    __tablename__ = "host_latency_stats"
+
+    host: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    window_hours: Mapped[int] = mapped_column(Integer, default=24)
+    sample_count: Mapped[int] = mapped_column(Integer, default=0)
+    error_count: Mapped[int] = mapped_column(Integer, default=0)
+    p50_ms: Mapped[int] = mapped_column(Integer, default=0)
+    p90_ms: Mapped[int] = mapped_column(Integer, default=0)
+    p99_ms: Mapped[int] = mapped_column(Integer, default=0)
+    max_ms: Mapped[int] = mapped_column(Integer, default=0)
+    refreshed_at: Mapped[str] = mapped_column(String(64), default="")
+
+
+class JobRunStat(Base):
+    """
+    Rollup: outcome counts per job_id from job_runs.
+    Recomputed by the scheduler (app.services.rollups.refresh_job_stats).
+    """
+
+    __tablename__ = "job_run_stats"
+
+    job_id: Mapped[str] = mapped_column(String(64), primary_key=True)
+
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    succeeded: Mapped[int] = mapped_column(Integer, default=0)
+    failed: Mapped[int] = mapped_column(Integer, default=0)
+    in_progress: Mapped[int] = mapped_column(Integer, default=0)
+    last_finished_at: Mapped[str] = mapped_column(String(64), default="")
+    refreshed_at: Mapped[str] = mapped_column(String(64), default="")
@@ -0,0 +1,29 @@
+from sqlalchemy import Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class ArchivedPage(Base):
+    """
+    Index of fetched pages kept in the PageArchive. The body itself lives on disk,
+    addressed by body_hash; identical bodies (across URLs or runs) are stored once.
+    """
+
+    __tablename__ = "archived_pages"
+    __table_args__ = (UniqueConstraint("source", "url", "body_hash", name="uq_archived_pages_source_url_body"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    source: Mapped[str] = mapped_column(String(64), index=True)
+    url: Mapped[str] = mapped_column(String(2048))
+    body_hash: Mapped[str] = mapped_column(String(64), index=True)  # sha256 of the raw body
+
+    status_code: Mapped[int] = mapped_column(Integer, default=0)
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    stored_bytes: Mapped[int] = mapped_column(Integer, default=0)  # compressed size on disk
+
+    job_id: Mapped[str] = mapped_column(String(64), default="")
+    run_id: Mapped[str] = mapped_column(String(64), default="")
+    first_fetched_at: Mapped[str] = mapped_column(String(64))
+    fetched_at: Mapped[str] = mapped_column(String(64), index=True)  # last time this exact body was seen
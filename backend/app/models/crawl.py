@@ -1,7 +1,11 @@
-from sqlalchemy import String, Text, DateTime, Integer, func, UniqueConstraint
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Text, DateTime, Integer, event, func, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
+from app.db.search import drop_search_index, install_search_index
 
 
 class CrawlRecord(Base):
@@ -18,6 +22,13 @@ class CrawlRecord(Base):
 
     fetched_at: Mapped[str] = mapped_column(String(64))  # ISO timestamp (simple MVP)
     created_at: Mapped[str] = mapped_column(String(64), default="")  # optional
+    # set by the database, not the writer (created_at can be a reprocessed page's fetch time)
+    inserted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+# full-text index lives outside the ORM table definition (dialect-specific DDL)
+event.listen(CrawlRecord.__table__, "after_create", lambda target, connection, **kw: install_search_index(connection))
+event.listen(CrawlRecord.__table__, "before_drop", lambda target, connection, **kw: drop_search_index(connection))
 
 
 class CrawlRequestLog(Base):
@@ -40,6 +51,11 @@ class CrawlRequestLog(Base):
     error_message: Mapped[str] = mapped_column(Text, default="")
     created_at: Mapped[str] = mapped_column(String(64), default="")
 
+    attempts: Mapped[int] = mapped_column(Integer, default=1)  # 0 = skipped (breaker open / budget spent)
+    breaker_state: Mapped[str] = mapped_column(String(16), default="")  # "closed"|"open"|"half_open"
+    # set by the database (created_at is the run's start, taken before the fetch)
+    inserted_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
 
 class JobRun(Base):
     __tablename__ = "job_runs"
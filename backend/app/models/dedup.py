@@ -0,0 +1,38 @@
+from sqlalchemy import ForeignKey, Index, Integer, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class RecordFingerprint(Base):
+    """
+    Dedup identity of a crawl_records row: canonical URL hash (title bands live in record_title_bands).
+    """
+
+    __tablename__ = "record_fingerprints"
+    __table_args__ = (Index("ix_record_fingerprints_source_url", "source", "canonical_url_hash"),)
+
+    record_id: Mapped[int] = mapped_column(ForeignKey("crawl_records.id", ondelete="CASCADE"), primary_key=True)
+
+    source: Mapped[str] = mapped_column(String(64))
+    canonical_host: Mapped[str] = mapped_column(String(255), default="")
+    canonical_url_hash: Mapped[str] = mapped_column(String(64))
+
+
+class RecordTitleBand(Base):
+    """
+    LSH buckets: the title MinHash signature split into bands. Titles above the
+    dedup threshold share at least one (band, bucket) with high probability, so
+    candidate lookup is an index probe instead of a table scan. No rows if the
+    title is too short to match on.
+    """
+
+    __tablename__ = "record_title_bands"
+    __table_args__ = (Index("ix_record_title_bands_lookup", "source", "band", "bucket"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    record_id: Mapped[int] = mapped_column(ForeignKey("crawl_records.id", ondelete="CASCADE"), index=True)
+    source: Mapped[str] = mapped_column(String(64))
+    band: Mapped[int] = mapped_column(SmallInteger)
+    bucket: Mapped[int] = mapped_column(Integer)
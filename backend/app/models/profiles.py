@@ -0,0 +1,26 @@
+from sqlalchemy import Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class JobProfile(Base):
+    """
+    Sampling profile + memory snapshot of one crawl run (joins job_runs on run_id).
+    """
+
+    __tablename__ = "job_profiles"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+
+    job_id: Mapped[str] = mapped_column(String(64), index=True)
+    run_id: Mapped[str] = mapped_column(String(64), unique=True)
+
+    created_at: Mapped[str] = mapped_column(String(64))
+    duration_ms: Mapped[int] = mapped_column(Integer, default=0)
+    interval_ms: Mapped[int] = mapped_column(Integer, default=5)
+    sample_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    folded: Mapped[str] = mapped_column(Text, default="")  # flamegraph.pl / speedscope input
+    stages: Mapped[str] = mapped_column(Text, default="{}")  # JSON: robots/throttle/network/parse/database/other
+    memory: Mapped[str] = mapped_column(Text, default="{}")  # JSON: tracemalloc peak + top growth
@@ -0,0 +1,16 @@
+from sqlalchemy import String, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class DataVersion(Base):
+    """
+    Monotonic change counter per dataset ("records", "jobs").
+    Writers bump it; read caches key on it, so a bump invalidates every cached response.
+    """
+
+    __tablename__ = "data_versions"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,20 @@
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class WorkerNode(Base):
+    """
+    Crawl worker membership for host-sharded crawling (app/crawling/sharding.py).
+    A node is live while its heartbeat is newer than WORKER_NODE_TTL_SECONDS.
+    """
+
+    __tablename__ = "worker_nodes"
+
+    node_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    hostname: Mapped[str] = mapped_column(String(255), default="")
+    pid: Mapped[int] = mapped_column(Integer, default=0)
+
+    started_at: Mapped[str] = mapped_column(String(64))
+    last_seen_at: Mapped[str] = mapped_column(String(64), index=True)
@@ -0,0 +1,77 @@
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.archive import ArchivedPage
+
+
+class ArchiveRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record_page(
+        self,
+        *,
+        source: str,
+        url: str,
+        body_hash: str,
+        status_code: int,
+        size_bytes: int,
+        stored_bytes: int,
+        job_id: str,
+        run_id: str,
+        fetched_at: str,
+    ) -> ArchivedPage:
+        row = self.db.scalar(
+            select(ArchivedPage).where(
+                ArchivedPage.source == source, ArchivedPage.url == url, ArchivedPage.body_hash == body_hash
+            )
+        )
+        if row:
+            row.status_code = status_code
+            row.job_id = job_id
+            row.run_id = run_id
+            row.fetched_at = fetched_at
+        else:
+            row = ArchivedPage(
+                source=source,
+                url=url,
+                body_hash=body_hash,
+                status_code=status_code,
+                size_bytes=size_bytes,
+                stored_bytes=stored_bytes,
+                job_id=job_id,
+                run_id=run_id,
+                first_fetched_at=fetched_at,
+                fetched_at=fetched_at,
+            )
+            self.db.add(row)
+        self.db.commit()
+        return row
+
+    def iter_pages(
+        self, *, source: Optional[str] = None, since: Optional[str] = None, latest_only: bool = True
+    ) -> Iterator[tuple[int, str, str, str, str]]:
+        """
+        (id, source, url, body_hash, fetched_at) oldest first.
+        latest_only keeps just the most recently seen body per (source, url).
+        """
+        stmt = select(
+            ArchivedPage.id, ArchivedPage.source, ArchivedPage.url, ArchivedPage.body_hash, ArchivedPage.fetched_at
+        )
+        if source:
+            stmt = stmt.where(ArchivedPage.source == source)
+        if since:
+            stmt = stmt.where(ArchivedPage.fetched_at >= since)
+        rows = self.db.execute(stmt.order_by(ArchivedPage.fetched_at, ArchivedPage.id))
+
+        if not latest_only:
+            for row in rows:
+                yield tuple(row)
+            return
+
+        latest: dict[tuple[str, str], tuple] = {}
+        for row in rows:
+            latest[(row.source, row.url)] = tuple(row)
+        yield from sorted(latest.values(), key=lambda r: (r[4], r[0]))
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import uuid
+from typing import Optional, Sequence
+
+from sqlalchemy import Double, Row, and_, cast, func, literal_column, or_, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import search
+from app.models.crawl import CrawlRecord, JobRun
+from app.models.profiles import JobProfile
+from app.models.versions import DataVersion
+from app.repositories.crawl_repo import CrawlRepository
+
+
+_RECORD_COLUMNS = (
+    CrawlRecord.id,
+    CrawlRecord.source,
+    CrawlRecord.title,
+    CrawlRecord.url,
+    CrawlRecord.tags,
+    CrawlRecord.fetched_at,
+    CrawlRecord.content_hash,
+)
+
+
+class AsyncCrawlRepository:
+    """
+    Async counterpart of CrawlRepository for the API's request paths.
+    Writes that share logic with the sync repository (version bumps, events)
+    delegate to it via AsyncSession.run_sync so there is one implementation.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def list_records(
+        self, *, limit: int, source: Optional[str] = None, before_id: Optional[int] = None
+    ) -> Sequence[Row]:
+        """
+        Newest records as plain column tuples (no ORM identity map / instances):
+        (id, source, title, url, tags, fetched_at, content_hash)
+
+        Keyset pagination: pass the last id of the previous page as `before_id`.
+        """
+        stmt = select(*_RECORD_COLUMNS)
+        if source:
+            stmt = stmt.where(CrawlRecord.source == source)
+        if before_id is not None:
+            stmt = stmt.where(CrawlRecord.id < before_id)
+        result = await self.db.execute(stmt.order_by(CrawlRecord.id.desc()).limit(limit))
+        return result.all()
+
+    async def search_records(
+        self,
+        *,
+        query: str,
+        limit: int,
+        source: Optional[str] = None,
+        after: Optional[tuple[float, int]] = None,
+    ) -> Sequence[Row]:
+        """
+        Full-text search over title + tags (prefix match on every term), best match first.
+        Rows are the list_records columns plus `score` (lower is better).
+
+        Keyset pagination: pass the (score, id) of the previous page's last row as `after`.
+        """
+        dialect = self.db.bind.dialect.name
+        match = search.match_query(search.search_terms(query), dialect)
+        if match is None:
+            return []
+
+        if dialect == "postgresql":
+            document = literal_column(search.SEARCH_DOCUMENT_PG)
+            tsquery = func.to_tsquery(literal_column(f"'{search.TS_CONFIG}'"), match)
+            # ts_rank_cd is float4: compared against the float8 from the cursor, rows tied with
+            # the previous page's last row would match neither > nor ==, so rank in float8
+            score = -cast(func.ts_rank_cd(document, tsquery), Double)
+            stmt = select(*_RECORD_COLUMNS, score.label("score")).where(document.op("@@")(tsquery))
+        else:
+            fts = table(search.FTS_TABLE)
+            score = func.bm25(literal_column(search.FTS_TABLE))
+            stmt = (
+                select(*_RECORD_COLUMNS, score.label("score"))
+                .join(fts, literal_column(f"{search.FTS_TABLE}.rowid") == CrawlRecord.id)
+                .where(literal_column(search.FTS_TABLE).op("MATCH")(match))
+            )
+
+        if source:
+            stmt = stmt.where(CrawlRecord.source == source)
+        if after is not None:
+            last_score, last_id = after
+            stmt = stmt.where(or_(score > last_score, and_(score == last_score, CrawlRecord.id < last_id)))
+
+        result = await self.db.execute(stmt.order_by(score, CrawlRecord.id.desc()).limit(limit))
+        return result.all()
+
+    async def list_jobs(self, *, limit: int) -> Sequence[JobRun]:
+        result = await self.db.scalars(select(JobRun).order_by(JobRun.id.desc()).limit(limit))
+        return result.all()
+
+    async def get_profile(self, run_id: str) -> Optional[JobProfile]:
+        return await self.db.scalar(select(JobProfile).where(JobProfile.run_id == run_id))
+
+    async def data_version(self, name: str) -> int:
+        value = await self.db.scalar(select(DataVersion.version).where(DataVersion.name == name))
+        return int(value or 0)
+
+    async def create_manual_job(self, *, now: str) -> JobRun:
+        job = JobRun(
+            job_id="manual_crawl",
+            run_id=uuid.uuid4().hex,
+            status="queued",
+            message="queued",
+            started_at=now,
+            finished_at="",
+        )
+        self.db.add(job)
+        await self.db.flush()
+        await self.db.run_sync(lambda s: CrawlRepository(s).job_changed(job))
+        await self.db.commit()
+        return job
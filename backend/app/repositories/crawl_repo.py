@@ -1,7 +1,26 @@
-from sqlalchemy import select
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from app.models.analytics import SourceHourlyCount
 from app.models.crawl import CrawlRecord, CrawlRequestLog, JobRun
+from app.models.profiles import JobProfile
+from app.models.versions import DataVersion
+from app.services.events import queue_event
+
+RECORDS_VERSION = "records"
+JOBS_VERSION = "jobs"
+
+
+def hour_bucket(ts: str) -> str:
+    """
+    Truncate an ISO-8601 UTC timestamp string to its hour bucket.
+    "2024-01-01T13:45:10.123+00:00" -> "2024-01-01T13:00:00+00:00"
+    """
+    return f"{ts[:13]}:00:00+00:00"
 
 
 class CrawlRepository:
@@ -25,6 +44,7 @@ class CrawlRepository:
             existing.url = url
             existing.tags = tags_csv
             existing.fetched_at = fetched_at
+            self._record_changed(existing, created=False)
             self.db.commit()
             self.db.refresh(existing)
             return existing
@@ -39,10 +59,87 @@ class CrawlRepository:
             created_at=fetched_at,
         )
         self.db.add(rec)
+        self.db.flush()  # assigns rec.id for the event payload
+        self._bump_hourly_count(source=source, fetched_at=fetched_at)
+        self._record_changed(rec, created=True)
         self.db.commit()
         self.db.refresh(rec)
         return rec
 
+    def merge_into(self, record_id: int, *, tags_csv: str, fetched_at: str) -> Optional[CrawlRecord]:
+        """
+        Fold a near-duplicate into an existing record: union tags, refresh fetched_at.
+        """
+        rec = self.db.get(CrawlRecord, record_id)
+        if rec is None:
+            return None
+        tags = [t for t in (rec.tags or "").split(",") if t]
+        tags += [t for t in tags_csv.split(",") if t and t not in tags]
+        rec.tags = ",".join(tags)
+        rec.fetched_at = max(rec.fetched_at or "", fetched_at)
+        self._record_changed(rec, created=False)
+        self.db.commit()
+        return rec
+
+    def _increment(self, model, key: dict, counter: str) -> None:
+        """
+        Add 1 to `counter` on the row matching `key`, inserting it at 1 if missing.
+        Done in SQL: concurrent writers must neither read-modify-write the count nor
+        race to insert the same key (the loser would fail on the primary / unique key).
+        """
+        column = getattr(model, counter)
+        dialect = self.db.get_bind().dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            self.db.execute(
+                insert(model)
+                .values(**key, **{counter: 1})
+                .on_conflict_do_update(
+                    index_elements=[getattr(model, k) for k in key],
+                    set_={counter: column + 1},
+                )
+            )
+            return
+
+        result = self.db.execute(
+            update(model).where(*(getattr(model, k) == v for k, v in key.items())).values({counter: column + 1})
+        )
+        if not result.rowcount:
+            self.db.add(model(**key, **{counter: 1}))
+
+    def _bump_hourly_count(self, *, source: str, fetched_at: str) -> None:
+        # Same transaction as the insert, so the rollup never drifts from crawl_records.
+        self._increment(SourceHourlyCount, {"source": source, "bucket": hour_bucket(fetched_at)}, "record_count")
+
+    def bump_version(self, name: str) -> None:
+        """
+        Increment a DataVersion counter. Does not commit: callers bump inside
+        the transaction that carries the change it describes.
+        """
+        self._increment(DataVersion, {"name": name}, "version")
+
+    def _record_changed(self, rec: CrawlRecord, *, created: bool) -> None:
+        queue_event(
+            self.db,
+            "record",
+            {"id": rec.id, "source": rec.source, "title": rec.title, "url": rec.url, "created": created},
+        )
+
+    def job_changed(self, row: JobRun) -> None:
+        """
+        Announce a JobRun state change (cache version + live event). Does not commit.
+        """
+        self.bump_version(JOBS_VERSION)
+        queue_event(
+            self.db,
+            "job",
+            {"id": row.id, "job_id": row.job_id, "run_id": row.run_id, "status": row.status},
+        )
+
+    def mark_records_changed(self) -> None:
+        self.bump_version(RECORDS_VERSION)
+        self.db.commit()
+
     def log_request(
         self,
         *,
@@ -57,6 +154,8 @@ class CrawlRepository:
         error_type: str = "",
         error_message: str = "",
         created_at: str,
+        attempts: int = 1,
+        breaker_state: str = "",
     ) -> None:
         row = CrawlRequestLog(
             job_id=job_id,
@@ -70,6 +169,8 @@ class CrawlRepository:
             error_type=error_type,
             error_message=error_message,
             created_at=created_at,
+            attempts=attempts,
+            breaker_state=breaker_state,
         )
         self.db.add(row)
         self.db.commit()
@@ -77,6 +178,8 @@ class CrawlRepository:
     def job_run_start(self, *, job_id: str, run_id: str, started_at: str) -> None:
         row = JobRun(job_id=job_id, run_id=run_id, status="started", started_at=started_at)
         self.db.add(row)
+        self.db.flush()
+        self.job_changed(row)
         self.db.commit()
 
     def job_run_finish(self, *, job_id: str, run_id: str, status: str, finished_at: str, message: str = "") -> None:
@@ -86,4 +189,36 @@ class CrawlRepository:
         row.status = status
         row.finished_at = finished_at
         row.message = message
-        self.db.commit()
\ No newline at end of file
+        self.job_changed(row)
+        self.db.commit()
+
+    def save_profile(
+        self,
+        *,
+        job_id: str,
+        run_id: str,
+        created_at: str,
+        duration_ms: int,
+        interval_ms: int,
+        sample_count: int,
+        folded: str,
+        stages: str,
+        memory: str,
+    ) -> JobProfile:
+        row = JobProfile(
+            job_id=job_id,
+            run_id=run_id,
+            created_at=created_at,
+            duration_ms=duration_ms,
+            interval_ms=interval_ms,
+            sample_count=sample_count,
+            folded=folded,
+            stages=stages,
+            memory=memory,
+        )
+        self.db.add(row)
+        self.db.commit()
+        return row
+
+    def get_profile(self, run_id: str) -> Optional[JobProfile]:
+        return self.db.scalar(select(JobProfile).where(JobProfile.run_id == run_id))
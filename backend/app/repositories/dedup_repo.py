@@ -0,0 +1,75 @@
+from typing import Optional, Sequence
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.crawl import CrawlRecord
+from app.models.dedup import RecordFingerprint, RecordTitleBand
+
+
+class DedupRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def find_by_url(self, *, source: str, canonical_url_hash: str) -> Optional[int]:
+        return self.db.scalar(
+            select(RecordFingerprint.record_id)
+            .where(RecordFingerprint.source == source, RecordFingerprint.canonical_url_hash == canonical_url_hash)
+            .order_by(RecordFingerprint.record_id)
+            .limit(1)
+        )
+
+    def find_band_candidates(self, *, source: str, bands: Sequence[tuple[int, int]]) -> list[tuple[int, int, str]]:
+        """
+        (record_id, title, canonical_host) of every fingerprint sharing at least one LSH bucket.
+        """
+        if not bands:
+            return []
+        match_any = or_(*(and_(RecordTitleBand.band == b, RecordTitleBand.bucket == v) for b, v in bands))
+        rows = self.db.execute(
+            select(RecordFingerprint.record_id, CrawlRecord.title, RecordFingerprint.canonical_host)
+            .join(RecordTitleBand, RecordTitleBand.record_id == RecordFingerprint.record_id)
+            .join(CrawlRecord, CrawlRecord.id == RecordFingerprint.record_id)
+            .where(RecordTitleBand.source == source, match_any)
+            .distinct()
+        ).all()
+        return [tuple(r) for r in rows]
+
+    def add_fingerprint(
+        self,
+        *,
+        record_id: int,
+        source: str,
+        canonical_host: str,
+        canonical_url_hash: str,
+        bands: Sequence[tuple[int, int]],
+    ) -> bool:
+        """
+        Store a fingerprint + its LSH bands. No-op (returns False) if the record already has one.
+        """
+        if self.db.get(RecordFingerprint, record_id) is not None:
+            return False
+
+        self.db.add(
+            RecordFingerprint(
+                record_id=record_id,
+                source=source,
+                canonical_host=canonical_host,
+                canonical_url_hash=canonical_url_hash,
+            )
+        )
+        self.db.add_all(
+            RecordTitleBand(record_id=record_id, source=source, band=band, bucket=bucket) for band, bucket in bands
+        )
+        self.db.commit()
+        return True
+
+    def records_without_fingerprint(self, *, limit: int) -> list[tuple[int, str, str, str]]:
+        rows = self.db.execute(
+            select(CrawlRecord.id, CrawlRecord.source, CrawlRecord.title, CrawlRecord.url)
+            .outerjoin(RecordFingerprint, RecordFingerprint.record_id == CrawlRecord.id)
+            .where(RecordFingerprint.record_id.is_(None))
+            .order_by(CrawlRecord.id)
+            .limit(limit)
+        ).all()
+        return [tuple(r) for r in rows]
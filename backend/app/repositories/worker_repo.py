@@ -0,0 +1,46 @@
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models.workers import WorkerNode
+
+
+class WorkerRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def heartbeat(self, *, node_id: str, hostname: str, pid: int, now: str) -> WorkerNode:
+        row = self.db.get(WorkerNode, node_id)
+        if row:
+            row.last_seen_at = now
+        else:
+            row = WorkerNode(node_id=node_id, hostname=hostname, pid=pid, started_at=now, last_seen_at=now)
+            self.db.add(row)
+        self.db.commit()
+        return row
+
+    def live_node_ids(self, *, since: str) -> list[str]:
+        """
+        Nodes whose last heartbeat is at/after `since` (ISO UTC, compared as strings), sorted.
+        """
+        return list(
+            self.db.scalars(
+                select(WorkerNode.node_id).where(WorkerNode.last_seen_at >= since).order_by(WorkerNode.node_id)
+            )
+        )
+
+    def remove(self, node_id: str) -> None:
+        self.db.execute(delete(WorkerNode).where(WorkerNode.node_id == node_id))
+        self.db.commit()
+
+    def prune(self, *, before: str, keep: Optional[str] = None) -> int:
+        """
+        Delete nodes last seen before `before` (never `keep`). Returns how many were removed.
+        """
+        stmt = delete(WorkerNode).where(WorkerNode.last_seen_at < before)
+        if keep:
+            stmt = stmt.where(WorkerNode.node_id != keep)
+        result = self.db.execute(stmt)
+        self.db.commit()
+        return result.rowcount or 0
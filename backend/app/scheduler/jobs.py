@@ -1,46 +1,172 @@
+import json
 import logging
+import threading
+import time
 import uuid
+from contextlib import nullcontext
 from datetime import datetime, timezone
+from typing import Optional
 
 from app.core.config import settings
 from app.crawling.robots import RobotsClient
 from app.crawling.throttle import HostThrottle
 from app.crawling.collector import HttpCollector
+from app.crawling.resilience import CircuitBreaker, ResilientCollector, RetryPolicy
+from app.crawling.sharding import shard_key
+from app.crawling.sources import SourceConfig, registry
 from app.db.session import SessionLocal
-from app.extractors.wikipedia import WikipediaExtractor
-from app.extractors.hackernews import HackerNewsExtractor
-from app.extractors.arxiv import ArxivExtractor
 from app.services.crawl_pipeline import CrawlPipeline
+from app.repositories.crawl_repo import CrawlRepository
+from app.services.page_archive import build_page_archive
+from app.services.profiling import profile_run
+from app.services.rollups import refresh_all
 
 logger = logging.getLogger("scheduler.jobs")
 
 
 USER_AGENT = "m3n0ko0g-learning-lounge-bot/0.1 (+education)"
 
+# process-wide so a failing host stays skipped across crawl cycles
+_breaker = CircuitBreaker(
+    failure_rate=settings.breaker_failure_rate,
+    min_samples=settings.breaker_min_samples,
+    window=settings.breaker_window,
+    cooldown_seconds=settings.breaker_cooldown_seconds,
+)
 
-def run_crawl_sampler() -> None:
+
+# Long-lived per process: robots.txt stays cached for its TTL, and each
+# host's throttle remembers the last request across overlapping runs.
+_robots = RobotsClient(user_agent=USER_AGENT, ttl_seconds=3600)
+_throttles: dict[str, HostThrottle] = {}
+_throttles_lock = threading.Lock()
+
+
+def _throttle_for(source: SourceConfig) -> HostThrottle:
+    """
+    One throttle per host (not per source): sources on the same site run as separate
+    scheduler jobs but must share its rate limit, at the strictest delay configured for it.
+    """
+    host = shard_key(source.url)
+    delay = max(
+        [source.min_delay_seconds]
+        + [s.min_delay_seconds for s in registry.sources() if shard_key(s.url) == host]
+    )
+    with _throttles_lock:
+        throttle = _throttles.get(host)
+        if throttle is None:
+            throttle = _throttles[host] = HostThrottle(min_delay_seconds=delay)
+        else:
+            # adjust in place so the host's last-request slots survive a config change
+            throttle.min_delay_seconds = delay
+    return throttle
+
+
+def _collector_for(source: SourceConfig, *, budget: Optional[float]) -> ResilientCollector:
+    return ResilientCollector(
+        HttpCollector(
+            user_agent=USER_AGENT,
+            robots=_robots,
+            throttle=_throttle_for(source),
+            timeout_seconds=settings.fetch_timeout_seconds,
+        ),
+        breaker=_breaker,
+        policy=RetryPolicy(
+            max_attempts=settings.fetch_max_attempts,
+            base_delay_seconds=settings.fetch_backoff_base_seconds,
+            max_delay_seconds=settings.fetch_backoff_max_seconds,
+        ),
+        request_timeout_seconds=settings.fetch_timeout_seconds,
+        run_budget_seconds=budget,
+    )
+
+
+def _crawl_sources(sources: list[SourceConfig], *, profile: bool = False) -> str:
     job_id = "crawl_sampler"
     run_id = uuid.uuid4().hex
     now = datetime.now(timezone.utc).isoformat()
 
-    logger.info("job_start", extra={"job_id": job_id, "run_id": run_id, "ts": now})
+    logger.info("job_start", extra={"job_id": job_id, "run_id": run_id, "ts": now, "sources": [s.name for s in sources]})
 
-    robots = RobotsClient(user_agent=USER_AGENT, ttl_seconds=3600)
-    throttle = HostThrottle(min_delay_seconds=1.0)
-    collector = HttpCollector(user_agent=USER_AGENT, robots=robots, throttle=throttle)
+    archive = build_page_archive()
+    budget = settings.crawl_run_budget_seconds or None
+    deadline = time.monotonic() + budget if budget else None
 
-    targets = [
-        ("python_docs", "https://docs.python.org/3/", WikipediaExtractor()),
+    with SessionLocal() as db:
+        with profile_run(interval=settings.profile_interval_ms / 1000) if profile else nullcontext() as prof:
+            for source in sources:
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                pipeline = CrawlPipeline(
+                    db=db,
+                    collector=_collector_for(source, budget=remaining),
+                    extractor=registry.extractor_for(source),
+                    dedup_threshold=settings.dedup_title_similarity if settings.dedup_title_similarity > 0 else None,
+                    archive=archive,
+                )
+                result = pipeline.run(job_id=job_id, run_id=run_id, source=source.name, start_url=source.url)
+                logger.info("job_target_result", extra={"job_id": job_id, "run_id": run_id, "source": source.name, "url": source.url, "result": result})
 
-        ("hackernews", "https://news.ycombinator.com/", HackerNewsExtractor()),
-        ("arxiv", "https://arxiv.org/list/cs.AI/recent", ArxivExtractor()),
-    ]
+        if prof is not None:
+            CrawlRepository(db).save_profile(
+                job_id=job_id,
+                run_id=run_id,
+                created_at=now,
+                duration_ms=prof.duration_ms,
+                interval_ms=settings.profile_interval_ms,
+                sample_count=prof.sample_count,
+                folded=prof.folded,
+                stages=json.dumps(prof.stages),
+                memory=json.dumps(prof.memory),
+            )
+            logger.info("job_profiled", extra={"job_id": job_id, "run_id": run_id, "stages": prof.stages})
 
-    with SessionLocal() as db:
-        for source, url, extractor in targets:
-            pipeline = CrawlPipeline(db=db, collector=collector, extractor=extractor)
-            result = pipeline.run(job_id=job_id, run_id=run_id, source=source, start_url=url)
-            logger.info("job_target_result", extra={"job_id": job_id, "run_id": run_id, "source": source, "url": url, "result": result})
+        # keep /crawl/stats current without waiting for the next scheduled refresh
+        refresh_all(db, window_hours=settings.stats_latency_window_hours)
 
     finished = datetime.now(timezone.utc).isoformat()
-    logger.info("job_end", extra={"job_id": job_id, "run_id": run_id, "ts": finished})
\ No newline at end of file
+    logger.info("job_end", extra={"job_id": job_id, "run_id": run_id, "ts": finished})
+    return run_id
+
+
+def run_crawl_sampler(*, profile: bool = False) -> str:
+    """
+    Crawl every enabled source once (manual runs). Returns the run_id.
+    With profile=True the run is sampled and stored in job_profiles.
+    """
+    return _crawl_sources(registry.sources(), profile=profile)
+
+
+def run_source(name: str) -> None:
+    """
+    Scheduled crawl of one registry source; skipped if it was removed or disabled since scheduling.
+    """
+    source = registry.get(name)
+    if source is None or not source.enabled:
+        logger.info("source_skipped", extra={"source": name})
+        return
+    _crawl_sources([source])
+
+
+def run_refresh_rollups() -> None:
+    with SessionLocal() as db:
+        result = refresh_all(db, window_hours=settings.stats_latency_window_hours)
+    logger.info("rollups_refreshed", extra={"result": result})
+
+
+def run_parquet_export() -> None:
+    """
+    Append new crawl_records / crawl_requests rows to the Parquet snapshot in PARQUET_EXPORT_DIR.
+    """
+    if not settings.parquet_export_dir:
+        return
+    # pyarrow (analytics extra) is only needed by this job, not at worker startup
+    from app.analytics.parquet_snapshot import export_snapshots
+
+    with SessionLocal() as db:
+        results = export_snapshots(
+            db,
+            settings.parquet_export_dir,
+            row_group_size=settings.parquet_row_group_size,
+            lag_seconds=settings.parquet_export_lag_seconds,
+        )
+    logger.info("parquet_exported", extra={"results": results})
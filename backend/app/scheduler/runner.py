@@ -1,30 +1,155 @@
+import argparse
+import logging
+import signal
 import time
+from typing import Optional
+from apscheduler.schedulers.base import BaseScheduler
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
+from app.core.config import settings
 from app.core.logging import configure_logging
-from app.db.init_db import init_db
-from app.scheduler.jobs import run_crawl_sampler
+from app.crawling.sharding import ShardCoordinator, build_shard_coordinator
+from app.crawling.sources import SourceRegistry, registry
+from app.scheduler.jobs import run_crawl_sampler, run_parquet_export, run_refresh_rollups, run_source
 
 configure_logging()
+logger = logging.getLogger("scheduler.runner")
 
+SOURCE_JOB_PREFIX = "crawl:"
+# ring keys of cluster-wide singleton jobs: only the sharded worker owning the key runs them
+PARQUET_EXPORT_KEY = "job:parquet_export"
+REFRESH_ROLLUPS_KEY = "job:refresh_rollups"
+# job id -> (schedule, concurrency) it was last scheduled with
+_scheduled: dict[str, tuple[str, int]] = {}
 
-def main() -> None:
-    # Ensure tables exist in the worker too
-    init_db()
+
+def sync_source_jobs(
+    scheduler: BaseScheduler,
+    sources: SourceRegistry = registry,
+    shard: Optional[ShardCoordinator] = None,
+) -> None:
+    """
+    Make the scheduler's crawl:<name> jobs match the registry: add new sources,
+    reschedule changed ones, remove deleted / disabled ones. Cheap when nothing
+    changed (one stat() of the sources file), so it runs on a short interval.
+
+    With a shard coordinator only the sources whose host this worker owns are kept.
+    """
+    wanted = {
+        f"{SOURCE_JOB_PREFIX}{s.name}": s for s in sources.sources() if shard is None or shard.owns(s.url)
+    }
+    existing = {job.id: job for job in scheduler.get_jobs() if job.id.startswith(SOURCE_JOB_PREFIX)}
+
+    for job_id in existing.keys() - wanted.keys():
+        scheduler.remove_job(job_id)
+        _scheduled.pop(job_id, None)
+        logger.info("source_job_removed", extra={"job": job_id})
+
+    for job_id, source in wanted.items():
+        signature = (source.schedule, source.concurrency)
+        if job_id in existing and _scheduled.get(job_id) == signature:
+            continue
+        scheduler.add_job(
+            run_source,
+            CronTrigger.from_crontab(source.schedule, timezone="UTC"),
+            args=[source.name],
+            id=job_id,
+            replace_existing=True,
+            max_instances=source.concurrency,
+            coalesce=True,
+        )
+        _scheduled[job_id] = signature
+        logger.info("source_job_scheduled", extra={"job": job_id, "schedule": source.schedule})
+
+
+def refresh_source_jobs(scheduler: BaseScheduler, shard: Optional[ShardCoordinator]) -> None:
+    """
+    Heartbeat (when sharded), then re-sync source jobs: picks up both sources-file
+    edits and host ownership moving between workers.
+    """
+    if shard is not None:
+        shard.heartbeat()
+    sync_source_jobs(scheduler, shard=shard)
+
+
+def refresh_rollups(shard: Optional[ShardCoordinator]) -> None:
+    if shard is not None and not shard.owns_key(REFRESH_ROLLUPS_KEY):
+        return
+    run_refresh_rollups()
+
+
+def export_parquet(shard: Optional[ShardCoordinator]) -> None:
+    if shard is not None and not shard.owns_key(PARQUET_EXPORT_KEY):
+        return
+    run_parquet_export()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="AutoForge crawl worker")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="run one profiled crawl of every enabled source, print its run_id and exit",
+    )
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        run_id = run_crawl_sampler(profile=True)
+        print(f"profiled run {run_id}: python -m app.services.profiling {run_id} > {run_id}.folded")
+        return
 
     scheduler = BackgroundScheduler(timezone="UTC")
 
-    # MVP: every 15 minutes. For class demos: "*/1 * * * *"
-    scheduler.add_job(run_crawl_sampler, CronTrigger.from_crontab("*/15 * * * *"), id="crawl_sampler")
+    # CRAWL_SHARDING: this worker only crawls the hosts it owns on the worker_nodes hash ring
+    shard = build_shard_coordinator()
+
+    # one cron job per registry source (schedules live in app/sources.yaml / SOURCES_FILE)
+    refresh_source_jobs(scheduler, shard)
+    # hot reload: pick up edits to the sources file (and shard membership) without restarting the worker
+    scheduler.add_job(
+        refresh_source_jobs,
+        IntervalTrigger(
+            seconds=settings.worker_heartbeat_seconds if shard is not None else settings.sources_reload_seconds
+        ),
+        args=[scheduler, shard],
+        id="sync_sources",
+        max_instances=1,
+        coalesce=True,
+    )
+    # /crawl/stats rollups (host latency percentiles, job success rates)
+    scheduler.add_job(
+        refresh_rollups,
+        IntervalTrigger(seconds=settings.stats_refresh_seconds),
+        args=[shard],
+        id="refresh_rollups",
+        max_instances=1,
+        coalesce=True,
+    )
+
+    # offline analytics: incremental Parquet snapshot (PARQUET_EXPORT_DIR)
+    if settings.parquet_export_dir:
+        scheduler.add_job(
+            export_parquet,
+            IntervalTrigger(seconds=settings.parquet_export_interval_seconds),
+            args=[shard],
+            id="parquet_export",
+            max_instances=1,
+            coalesce=True,
+        )
 
     scheduler.start()
+    # docker stop / k8s send SIGTERM: shut down like Ctrl-C so a sharded worker hands its hosts over
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
 
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         scheduler.shutdown()
+        if shard is not None:
+            shard.leave()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,11 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
+from typing import Any, Optional
 from datetime import datetime, timezone
 import re
 
 
 URL_RE = re.compile(r"^https?://[^\s]+$")
+TAG_RE = re.compile(r"[a-z0-9][a-z0-9\-]{0,31}")
 
 
 class CrawlRecordIn(BaseModel):
@@ -27,11 +29,26 @@ class CrawlRecordIn(BaseModel):
         for t in v:
             if len(t) > 32:
                 raise ValueError("tag too long")
-            if not re.fullmatch(r"[a-z0-9][a-z0-9\-]{0,31}", t):
+            if not TAG_RE.fullmatch(t):
                 raise ValueError("tag must be kebab-case")
         return v
 
 
+# One validator call per page instead of one model construction per item.
+_records_in_adapter = TypeAdapter(list[CrawlRecordIn])
+
+
+def validate_records(items: list[dict[str, Any]], *, fetched_at: Optional[str] = None) -> list[CrawlRecordIn]:
+    """
+    Validate a page's worth of extracted items in one pass.
+    Items without fetched_at share a single timestamp (the page's), not one clock read each.
+    """
+    stamp = fetched_at or datetime.now(timezone.utc).isoformat()
+    for item in items:
+        item.setdefault("fetched_at", stamp)
+    return _records_in_adapter.validate_python(items)
+
+
 class CrawlRecordOut(BaseModel):
     id: int
     source: str
@@ -39,4 +56,8 @@ class CrawlRecordOut(BaseModel):
     url: str
     tags: list[str]
     fetched_at: str
-    content_hash: str
\ No newline at end of file
+    content_hash: str
+
+class CrawlRecordSearchOut(BaseModel):
+    items: list[CrawlRecordOut]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
@@ -1,27 +1,85 @@
 import hashlib
 import logging
 from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
 from datetime import datetime, timezone
 from urllib.parse import urlparse
 
 from sqlalchemy.orm import Session
 
-from app.crawling.collector import BaseCollector, CrawlBlockedByRobots
+from app.core.config import settings
+from app.crawling.collector import BaseCollector, CrawlBlockedByRobots, FetchResult
+from app.crawling.validators import canonicalize_url, normalize_title
 from app.extractors.base import BaseExtractor
+from app.repositories.archive_repo import ArchiveRepository
 from app.repositories.crawl_repo import CrawlRepository
 from app.schemas.crawl import CrawlRecordIn
+from app.services.dedup import DEFAULT_THRESHOLD, DedupIndex, fingerprint
+from app.services.page_archive import PageArchive
 
 logger = logging.getLogger("crawl.pipeline")
 
 
-def compute_hash(source: str, title: str, url: str) -> str:
-    h = hashlib.sha256()
-    h.update(source.encode("utf-8"))
-    h.update(b"\n")
-    h.update(title.strip().encode("utf-8"))
-    h.update(b"\n")
-    h.update(url.strip().encode("utf-8"))
-    return h.hexdigest()
+def _xxh3(data: bytes) -> str:
+    try:
+        import xxhash
+    except ImportError as e:
+        raise RuntimeError("xxhash not installed. Install with: pip install '.[fasthash]'") from e
+    return xxhash.xxh3_128_hexdigest(data)
+
+
+# RECORD_HASH_ALGORITHM -> bytes -> hex digest (<= 64 chars, fits content_hash).
+# Changing it on an existing database means old rows no longer match by content_hash;
+# the dedup index still folds re-crawled items onto them by canonical URL (rows older
+# than the index are fingerprinted by `python -m app.db.migrate`).
+HASHERS: dict[str, Callable[[bytes], str]] = {
+    "sha256": lambda data: hashlib.sha256(data).hexdigest(),
+    "blake2b": lambda data: hashlib.blake2b(data, digest_size=32).hexdigest(),
+    "xxh3": _xxh3,  # non-cryptographic, fastest; fine for identity, not for integrity
+}
+
+
+def compute_hash(source: str, title: str, url: str, *, algorithm: Optional[str] = None) -> str:
+    # one encode of the joined fields; same bytes as hashing them separately with "\n" between
+    data = f"{source}\n{title.strip()}\n{url.strip()}".encode("utf-8")
+    return HASHERS[algorithm or settings.record_hash_algorithm](data)
+
+
+def ingest_records(repo: CrawlRepository, dedup: DedupIndex, records: Iterable[CrawlRecordIn]) -> tuple[int, int, int]:
+    """
+    Normalize, dedup and store extracted records. Returns (seen, saved, merged).
+    Shared by live crawls and offline reprocessing.
+    """
+    seen = saved = merged = 0
+    for record in records:
+        seen += 1
+
+        title = normalize_title(record.title)
+        # canonical form is for identity only; the stored url stays the one that was extracted
+        # (forcing https / dropping params can break http-only or ?ref= links)
+        canonical_url = canonicalize_url(record.url, record.source)
+        tags_csv = ",".join(record.tags)
+
+        fp = fingerprint(record.source, title, canonical_url)
+        duplicate_of = dedup.find_duplicate(fp)
+        if duplicate_of is not None:
+            repo.merge_into(duplicate_of, tags_csv=tags_csv, fetched_at=record.fetched_at)
+            merged += 1
+            saved += 1
+            continue
+
+        # hash the canonical URL so tracking-param variants collapse onto one row
+        rec = repo.upsert_record(
+            source=record.source,
+            title=title,
+            url=record.url.strip(),
+            tags_csv=tags_csv,
+            fetched_at=record.fetched_at,
+            content_hash=compute_hash(record.source, title, canonical_url),
+        )
+        dedup.add(rec.id, fp)
+        saved += 1
+    return seen, saved, merged
 
 
 @dataclass
@@ -29,6 +87,29 @@ class CrawlPipeline:
     db: Session
     collector: BaseCollector
     extractor: BaseExtractor
+    # min title similarity for near-duplicates; None = canonical-URL matches only
+    dedup_threshold: Optional[float] = DEFAULT_THRESHOLD
+    # raw bodies go here for offline re-extraction (app.services.reprocess)
+    archive: Optional[PageArchive] = None
+
+    def _archive_page(self, *, job_id: str, run_id: str, source: str, fetch: FetchResult, fetched_at: str) -> None:
+        # best effort: a full disk must not fail the crawl itself
+        try:
+            stored = self.archive.put(fetch.text.encode("utf-8"))
+            ArchiveRepository(self.db).record_page(
+                source=source,
+                url=fetch.url,
+                body_hash=stored.body_hash,
+                status_code=fetch.status_code,
+                size_bytes=stored.size_bytes,
+                stored_bytes=stored.stored_bytes,
+                job_id=job_id,
+                run_id=run_id,
+                fetched_at=fetched_at,
+            )
+        except Exception:
+            self.db.rollback()
+            logger.warning("archive_write_failed", extra={"job_id": job_id, "run_id": run_id, "url": fetch.url}, exc_info=True)
 
     def run(self, *, job_id: str, run_id: str, source: str, start_url: str) -> dict:
         repo = CrawlRepository(self.db)
@@ -36,9 +117,6 @@ class CrawlPipeline:
 
         repo.job_run_start(job_id=job_id, run_id=run_id, started_at=now)
 
-        total_saved = 0
-        total_seen = 0
-
         try:
             fetch = self.collector.fetch(start_url)
             repo.log_request(
@@ -51,27 +129,21 @@ class CrawlPipeline:
                 status_code=fetch.status_code,
                 duration_ms=fetch.duration_ms,
                 created_at=now,
+                attempts=fetch.attempts,
+                breaker_state=fetch.breaker_state,
             )
 
-            records = self.extractor.extract(source=source, url=start_url, html=fetch.text)
+            if self.archive is not None:
+                self._archive_page(job_id=job_id, run_id=run_id, source=source, fetch=fetch, fetched_at=now)
 
-            for r in records:
-                # Validator happens here because CrawlRecordIn is Pydantic
-                record: CrawlRecordIn = r
-                total_seen += 1
+            records = self.extractor.extract(source=source, url=start_url, html=fetch.text)
 
-                tags_csv = ",".join(record.tags)
-                content_hash = compute_hash(record.source, record.title, record.url)
+            total_seen, total_saved, total_merged = ingest_records(
+                repo, DedupIndex(self.db, threshold=self.dedup_threshold), records
+            )
 
-                repo.upsert_record(
-                    source=record.source,
-                    title=record.title,
-                    url=record.url,
-                    tags_csv=tags_csv,
-                    fetched_at=record.fetched_at,
-                    content_hash=content_hash,
-                )
-                total_saved += 1
+            if total_saved:
+                repo.mark_records_changed()
 
             finished = datetime.now(timezone.utc).isoformat()
             repo.job_run_finish(job_id=job_id, run_id=run_id, status="success", finished_at=finished)
@@ -85,10 +157,11 @@ class CrawlPipeline:
                     "start_url": start_url,
                     "saved": total_saved,
                     "seen": total_seen,
+                    "merged": total_merged,
                 },
             )
 
-            return {"ok": True, "saved": total_saved, "seen": total_seen}
+            return {"ok": True, "saved": total_saved, "seen": total_seen, "merged": total_merged}
 
         except CrawlBlockedByRobots as e:
             host = urlparse(start_url).netloc
@@ -111,6 +184,8 @@ class CrawlPipeline:
             return {"ok": False, "error": "robots_blocked"}
 
         except Exception as e:
+            # a failed statement (e.g. an integrity error while ingesting) leaves the session unusable
+            self.db.rollback()
             host = urlparse(start_url).netloc
             repo.log_request(
                 job_id=job_id,
@@ -119,11 +194,14 @@ class CrawlPipeline:
                 url=start_url,
                 host=host,
                 robots_allowed=True,
-                status_code=0,
+                status_code=getattr(e, "status_code", 0),
                 duration_ms=0,
-                error_type=type(e).__name__,
+                # FetchFailed (ResilientCollector) carries the underlying error + retry info
+                error_type=getattr(e, "error_type", type(e).__name__),
                 error_message=str(e),
                 created_at=now,
+                attempts=getattr(e, "attempts", 1),
+                breaker_state=getattr(e, "breaker_state", ""),
             )
             finished = datetime.now(timezone.utc).isoformat()
             repo.job_run_finish(job_id=job_id, run_id=run_id, status="failed", finished_at=finished, message=str(e))
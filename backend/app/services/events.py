@@ -0,0 +1,196 @@
+"""
+Live crawl events (job state changes, upserted records).
+
+Writers call `queue_event(db, ...)` inside their transaction:
+
+- Postgres: the event is sent with pg_notify, which Postgres delivers on
+  commit. Each API process holds ONE listening connection
+  (PgNotifyListener) and fans notifications out to its local broker, so
+  worker writes reach every dashboard without any polling.
+- Other databases: events are held on the session and published to the
+  in-process broker after commit (single-process / dev setups).
+
+Slow subscribers never block publishers: each one has a bounded queue,
+the oldest event is dropped when it is full, and the subscriber is told
+how many it missed so it can refetch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger("crawl.events")
+
+CHANNEL = "crawl_events"
+_PENDING_KEY = "pending_crawl_events"
+
+
+@dataclass(eq=False)
+class Subscription:
+    queue: asyncio.Queue
+    loop: asyncio.AbstractEventLoop
+    dropped: int = 0
+    types: Optional[frozenset[str]] = None
+
+    def offer(self, item: dict) -> None:
+        # runs on the subscriber's event loop
+        if self.types is not None and item.get("type") not in self.types:
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(item)
+
+
+class EventBroker:
+    """
+    In-process fan-out from any thread to asyncio subscribers.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subs: set[Subscription] = set()
+        self._lock = threading.Lock()
+
+    def publish(self, item: dict) -> None:
+        with self._lock:
+            subs = list(self._subs)
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.offer, item)
+            except RuntimeError:
+                # loop already closed; the subscriber is going away
+                self._discard(sub)
+
+    def subscribe(self, types: Optional[set[str]] = None) -> Subscription:
+        sub = Subscription(
+            queue=asyncio.Queue(maxsize=self.queue_size),
+            loop=asyncio.get_running_loop(),
+            types=frozenset(types) if types else None,
+        )
+        with self._lock:
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._discard(sub)
+
+    def _discard(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subs.discard(sub)
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subs)
+
+    async def stream(self, sub: Subscription, *, heartbeat_seconds: float) -> AsyncIterator[Optional[dict]]:
+        """
+        Yield events for `sub`; yields None when idle for `heartbeat_seconds`.
+        A {"type": "lagged"} event is emitted first whenever events were dropped.
+        """
+        while True:
+            try:
+                item = await asyncio.wait_for(sub.queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if sub.dropped:
+                dropped, sub.dropped = sub.dropped, 0
+                yield {"type": "lagged", "data": {"dropped": dropped}}
+            yield item
+
+
+broker = EventBroker(queue_size=settings.events_queue_size)
+
+
+def queue_event(db: Session, event_type: str, data: dict[str, Any]) -> None:
+    """
+    Emit an event as part of the current transaction (delivered on commit).
+    """
+    item = {"type": event_type, "data": data}
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": json.dumps(item)})
+        return
+    db.info.setdefault(_PENDING_KEY, []).append(item)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    for item in pending or ():
+        broker.publish(item)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_pending(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+class PgNotifyListener:
+    """
+    One LISTEN connection per process, feeding the local broker.
+    Reconnects with backoff if the connection drops.
+    """
+
+    def __init__(self, database_url: str, *, target: EventBroker = broker, channel: str = CHANNEL):
+        self.dsn = make_url(database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.target = target
+        self.channel = channel
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="pg-notify-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        import psycopg
+
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {self.channel}")
+                    backoff = 1.0
+                    while not self._stop.is_set():
+                        for note in conn.notifies(timeout=1.0):
+                            try:
+                                self.target.publish(json.loads(note.payload))
+                            except ValueError:
+                                logger.warning("event_bad_payload", extra={"payload": note.payload[:200]})
+            except Exception:
+                logger.exception("event_listener_error")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+
+def sse_format(item: dict) -> bytes:
+    return f"event: {item['type']}\ndata: {json.dumps(item['data'], separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+def start_listener(database_url: str) -> Optional[PgNotifyListener]:
+    if make_url(database_url).get_backend_name() != "postgresql":
+        return None
+    listener = PgNotifyListener(database_url)
+    listener.start()
+    logger.info("event_listener_started", extra={"channel": CHANNEL})
+    return listener
@@ -0,0 +1,87 @@
+"""
+Content-addressed, zstd-compressed store for raw fetched pages.
+
+Bodies are keyed by sha256 and written once:
+
+    <root>/ab/cd/abcd...ef.zst
+
+so re-fetching an unchanged page costs a stat() and no disk space, and
+extractors can be re-run over history (app.services.reprocess) without
+touching the network.
+
+Pro Tip:
+Write to a temp file and os.replace() it into place — concurrent workers
+storing the same body then race harmlessly instead of leaving a torn file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from app.core.config import settings
+
+
+def _zstd() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise RuntimeError("zstandard not installed. Install with: pip install '.[archive]'") from e
+    return zstandard
+
+
+@dataclass(frozen=True)
+class StoredBody:
+    body_hash: str
+    size_bytes: int
+    stored_bytes: int
+    created: bool  # False when the body was already archived
+
+
+class PageArchive:
+    def __init__(self, root: str | os.PathLike, *, level: int = 6):
+        zstd = _zstd()
+        self.root = Path(root)
+        self.level = level
+        self._compressor = zstd.ZstdCompressor(level=level)
+        self._decompressor = zstd.ZstdDecompressor()
+
+    def path_for(self, body_hash: str) -> Path:
+        return self.root / body_hash[:2] / body_hash[2:4] / f"{body_hash}.zst"
+
+    def put(self, body: bytes) -> StoredBody:
+        body_hash = hashlib.sha256(body).hexdigest()
+        path = self.path_for(body_hash)
+        if path.exists():
+            return StoredBody(body_hash, len(body), path.stat().st_size, created=False)
+
+        data = self._compressor.compress(body)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return StoredBody(body_hash, len(body), len(data), created=True)
+
+    def get(self, body_hash: str) -> bytes:
+        return self._decompressor.decompress(self.path_for(body_hash).read_bytes())
+
+    def __contains__(self, body_hash: str) -> bool:
+        return self.path_for(body_hash).exists()
+
+
+def build_page_archive() -> Optional[PageArchive]:
+    """
+    PageArchive from settings, or None when PAGE_ARCHIVE_DIR is unset (archiving off).
+    """
+    if not settings.page_archive_dir:
+        return None
+    return PageArchive(settings.page_archive_dir, level=settings.page_archive_zstd_level)
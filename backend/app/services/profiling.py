@@ -0,0 +1,204 @@
+"""
+Profiling for a single crawl run: a statistical stack sampler plus
+tracemalloc snapshots, stored in job_profiles next to the JobRun.
+
+The sampler reads the crawling thread's stack every `interval` seconds from
+a background thread (sys._current_frames), so the crawl itself runs
+unmodified and the overhead stays flat no matter how many calls it makes —
+unlike cProfile, which instruments every call.
+
+Output is "folded stacks" (one `frame;frame;frame count` line per unique
+stack), which flamegraph.pl, speedscope and inferno read directly:
+
+    python -m app.scheduler.runner --profile          # one profiled crawl, prints run_id
+    python -m app.services.profiling <run_id> > run.folded
+    GET /crawl/runs/<run_id>/profile
+
+Pro Tip:
+Look at the "stages" summary first — it says whether a slow run was
+robots checks, throttling, network, parsing or the database before you
+open the flamegraph.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Iterator, Optional
+
+# First matching rule wins, checked against every frame of a sample (outermost
+# caller included), so e.g. the network I/O of a robots.txt fetch counts as "robots".
+STAGE_RULES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("robots", ("app.crawling.robots", "urllib.robotparser")),
+    ("throttle", ("app.crawling.throttle",)),
+    ("database", ("sqlalchemy", "sqlite3", "psycopg", "app.repositories")),
+    ("parse", ("bs4", "lxml", "soupsieve", "app.extractors", "pydantic", "app.schemas")),
+    ("network", ("httpx", "httpcore", "h11", "ssl", "socket", "anyio")),
+)
+
+
+def _frame_name(frame: FrameType) -> str:
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{frame.f_code.co_qualname}"
+
+
+def classify(stack: tuple[str, ...]) -> str:
+    for stage, prefixes in STAGE_RULES:
+        for name in stack:
+            module = name.split(":", 1)[0]
+            if module.startswith(prefixes):
+                return stage
+    return "other"
+
+
+class StackSampler:
+    """
+    Samples one thread's Python stack at a fixed interval.
+    """
+
+    def __init__(self, *, interval: float = 0.005, thread_id: Optional[int] = None, max_depth: int = 128):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.max_depth = max_depth
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None and len(stack) < self.max_depth:
+            stack.append(_frame_name(frame))
+            frame = frame.f_back
+        if stack:
+            self.stacks[tuple(reversed(stack))] += 1  # root first, as folded format expects
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.stacks.values())
+
+
+def folded(stacks: Counter[tuple[str, ...]]) -> str:
+    lines = [f"{';'.join(stack)} {count}" for stack, count in stacks.most_common()]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+def stage_breakdown(stacks: Counter[tuple[str, ...]], interval: float) -> dict[str, dict]:
+    totals: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        totals[classify(stack)] += count
+    n = sum(totals.values()) or 1
+    return {
+        stage: {"samples": count, "approx_ms": round(count * interval * 1000, 1), "share": round(count / n, 3)}
+        for stage, count in totals.most_common()
+    }
+
+
+@dataclass
+class RunProfile:
+    interval: float
+    started: float = field(default_factory=time.perf_counter)
+    duration_ms: int = 0
+    sample_count: int = 0
+    folded: str = ""
+    stages: dict = field(default_factory=dict)
+    memory: dict = field(default_factory=dict)
+
+
+@contextmanager
+def profile_run(*, interval: float = 0.005, top_allocations: int = 25) -> Iterator[RunProfile]:
+    """
+    Profile the calling thread for the duration of the block; results are filled in on exit.
+    """
+    result = RunProfile(interval=interval)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(1)
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+
+    sampler = StackSampler(interval=interval)
+    sampler.start()
+    try:
+        yield result
+    finally:
+        sampler.stop()
+        after = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if started_tracing:
+            tracemalloc.stop()
+
+        result.duration_ms = int((time.perf_counter() - result.started) * 1000)
+        result.sample_count = sampler.sample_count
+        result.folded = folded(sampler.stacks)
+        result.stages = stage_breakdown(sampler.stacks, interval)
+        result.memory = {
+            "current_kb": current // 1024,
+            "peak_kb": peak // 1024,
+            # allocations made during the run that were still alive at the end
+            "top_growth": [
+                {"where": str(stat.traceback[0]), "size_kb": round(stat.size_diff / 1024, 1), "count": stat.count_diff}
+                for stat in after.compare_to(before, "lineno")[:top_allocations]
+                if stat.size_diff > 0
+            ],
+        }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Print the stored profile of a crawl run.")
+    parser.add_argument("run_id")
+    parser.add_argument("--json", action="store_true", help="stages + memory summary instead of folded stacks")
+    args = parser.parse_args(argv)
+
+    from app.db.session import SessionLocal
+    from app.repositories.crawl_repo import CrawlRepository
+
+    with SessionLocal() as db:
+        row = CrawlRepository(db).get_profile(args.run_id)
+        if row is None:
+            print(f"no profile for run {args.run_id}", file=sys.stderr)
+            return 1
+        if args.json:
+            print(json.dumps(profile_summary(row), indent=2))
+        else:
+            sys.stdout.write(row.folded)
+    return 0
+
+
+def profile_summary(row) -> dict:
+    return {
+        "run_id": row.run_id,
+        "job_id": row.job_id,
+        "created_at": row.created_at,
+        "duration_ms": row.duration_ms,
+        "interval_ms": row.interval_ms,
+        "sample_count": row.sample_count,
+        "stages": json.loads(row.stages or "{}"),
+        "memory": json.loads(row.memory or "{}"),
+    }
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
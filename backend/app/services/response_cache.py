@@ -0,0 +1,103 @@
+"""
+Read-endpoint response cache with write-driven invalidation.
+
+Cached bodies are keyed by the dataset's DataVersion counter, which the
+repository bumps whenever a crawl writes. A bump therefore invalidates
+every cached listing at once, in every API process, without explicit
+deletes. The same version feeds the ETag, so polling clients that send
+If-None-Match get a 304 without the body being rebuilt or re-sent.
+
+Pro Tip:
+Version-keyed caches never need "delete on write" — stale entries just
+stop being addressed and age out via TTL/LRU.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Awaitable, Callable, Optional, Union
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.cache import RedisCache, TTLCache
+from app.core.config import settings
+
+
+def encode_json(payload: Any) -> bytes:
+    # orjson handles dict/list/str/int natively; anything else goes through FastAPI's encoder
+    return orjson.dumps(payload, default=jsonable_encoder)
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [c.strip() for c in header.split(",")]
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+class ResponseCache:
+    def __init__(self, store: Union[TTLCache, RedisCache], *, version_ttl_seconds: float = 1.0):
+        self.store = store
+        # Coalesce version lookups from tight polling loops into one PK read per interval.
+        self._versions = TTLCache(ttl_seconds=version_ttl_seconds, max_entries=64)
+
+    def forget_versions(self) -> None:
+        """
+        Drop memoised versions (call after a write in this process to skip the version TTL).
+        """
+        self._versions.clear()
+
+    def _etag(self, name: str, version: int, params: dict) -> tuple[str, str]:
+        param_key = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        digest = hashlib.blake2s(param_key.encode("utf-8"), digest_size=6).hexdigest()
+        return f'"{name}-{version}-{digest}"', f"{name}:{version}:{param_key}"
+
+    async def respond(
+        self,
+        request: Request,
+        *,
+        name: str,
+        params: dict,
+        version: Callable[[], Awaitable[int]],
+        build: Callable[[], Awaitable[Any]],
+    ) -> Response:
+        """
+        `version` and `build` are coroutines (e.g. AsyncCrawlRepository calls);
+        `build` only runs on a cache miss.
+        """
+        current = self._versions.get(name)
+        if current is None:
+            current = await version()
+            self._versions.set(name, current)
+
+        etag, key = self._etag(name, current, params)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        body = self.store.get(key)
+        if body is None:
+            body = encode_json(await build())
+            self.store.set(key, body)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+def build_response_cache() -> ResponseCache:
+    if settings.response_cache_backend == "redis":
+        store: Union[TTLCache, RedisCache] = RedisCache(
+            settings.response_cache_ttl_seconds,
+            url=settings.redis_url,
+            prefix="autoforge:responses:",
+        )
+    else:
+        store = TTLCache(settings.response_cache_ttl_seconds, max_entries=settings.response_cache_max_entries)
+    return ResponseCache(store, version_ttl_seconds=settings.response_cache_version_ttl_seconds)
+
+
+response_cache = build_response_cache()
@@ -0,0 +1,148 @@
+"""
+Rollup refreshers for the /crawl/stats endpoints.
+
+source_hourly_counts is maintained on write by the repository; the
+tables here summarise crawl_requests / job_runs and are recomputed on a
+schedule by the worker (see app.scheduler.runner).
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+from datetime import datetime, timedelta, timezone
+
+from typing import Any
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.analytics import HostLatencyStat, JobRunStat
+from app.models.crawl import CrawlRequestLog, JobRun
+
+SUCCESS_STATUSES = {"success"}
+FAILED_STATUSES = {"failed", "error"}
+
+
+def _replace_rows(db: Session, model: Any, key: str, rows: list[dict]) -> None:
+    """
+    Make `model`'s table hold exactly `rows` (one per `key`), then commit.
+
+    Upserts instead of delete-then-insert: refreshes can overlap (several workers,
+    a manual run from the API), and two concurrent delete+insert passes collide on
+    the primary key on Postgres.
+    """
+    key_column = getattr(model, key)
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if rows:
+            insert = (pg_insert if dialect == "postgresql" else sqlite_insert)(model).values(rows)
+            db.execute(
+                insert.on_conflict_do_update(
+                    index_elements=[key_column],
+                    set_={c: insert.excluded[c] for c in rows[0] if c != key},
+                )
+            )
+        db.execute(delete(model).where(key_column.not_in([r[key] for r in rows])))
+    else:
+        db.execute(delete(model))
+        db.add_all(model(**r) for r in rows)
+    db.commit()
+
+
+def _nearest_rank(ordered: list[int], q: float) -> int:
+    if not ordered:
+        return 0
+    rank = max(1, min(len(ordered), math.ceil(q / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def refresh_host_latency(db: Session, *, window_hours: int = 24) -> int:
+    """
+    Recompute host_latency_stats from the last `window_hours` of crawl_requests.
+    Returns the number of hosts written.
+    """
+    now = datetime.now(timezone.utc)
+    cutoff = (now - timedelta(hours=window_hours)).isoformat()
+
+    stmt = (
+        select(CrawlRequestLog.host, CrawlRequestLog.duration_ms, CrawlRequestLog.status_code, CrawlRequestLog.error_type)
+        .where(CrawlRequestLog.created_at >= cutoff)
+        .order_by(CrawlRequestLog.host, CrawlRequestLog.duration_ms)
+        .execution_options(yield_per=10_000)
+    )
+
+    stats: list[dict] = []
+    for host, rows in itertools.groupby(db.execute(stmt), key=lambda r: r[0]):
+        durations: list[int] = []
+        errors = 0
+        for _, duration_ms, status_code, error_type in rows:
+            if error_type or not status_code or status_code >= 500:
+                errors += 1
+            if status_code:
+                # rows arrive sorted by duration, so this list stays sorted
+                durations.append(int(duration_ms or 0))
+
+        stats.append(
+            dict(
+                host=host,
+                window_hours=window_hours,
+                sample_count=len(durations),
+                error_count=errors,
+                p50_ms=_nearest_rank(durations, 50),
+                p90_ms=_nearest_rank(durations, 90),
+                p99_ms=_nearest_rank(durations, 99),
+                max_ms=durations[-1] if durations else 0,
+                refreshed_at=now.isoformat(),
+            )
+        )
+
+    _replace_rows(db, HostLatencyStat, "host", stats)
+    return len(stats)
+
+
+def refresh_job_stats(db: Session) -> int:
+    """
+    Recompute job_run_stats from job_runs with a single GROUP BY.
+    Returns the number of job ids written.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    rows = db.execute(
+        select(JobRun.job_id, JobRun.status, func.count(JobRun.id), func.max(JobRun.finished_at)).group_by(
+            JobRun.job_id, JobRun.status
+        )
+    ).all()
+
+    by_job: dict[str, JobRunStat] = {}
+    for job_id, status, count, last_finished in rows:
+        stat = by_job.get(job_id)
+        if stat is None:
+            stat = by_job[job_id] = JobRunStat(
+                job_id=job_id, total=0, succeeded=0, failed=0, in_progress=0, last_finished_at="", refreshed_at=now
+            )
+        stat.total += count
+        if status in SUCCESS_STATUSES:
+            stat.succeeded += count
+        elif status in FAILED_STATUSES:
+            stat.failed += count
+        else:
+            stat.in_progress += count
+        if last_finished and last_finished > stat.last_finished_at:
+            stat.last_finished_at = last_finished
+
+    _replace_rows(
+        db,
+        JobRunStat,
+        "job_id",
+        [{c.key: getattr(stat, c.key) for c in JobRunStat.__table__.columns} for stat in by_job.values()],
+    )
+    return len(by_job)
+
+
+def refresh_all(db: Session, *, window_hours: int = 24) -> dict:
+    return {
+        "hosts": refresh_host_latency(db, window_hours=window_hours),
+        "jobs": refresh_job_stats(db),
+    }
@@ -0,0 +1,346 @@
+"""
+End-to-end crawl benchmark.
+
+Runs the real CrawlPipeline (collector -> extractor -> repository) against
+the local fixture site for every configured database and prints one JSON
+document with throughput, per-stage latency percentiles and peak RSS.
+
+Usage (from backend/):
+
+    python -m benchmarks.crawl_bench --pages 50 --output bench.json
+    python -m benchmarks.crawl_bench --compare bench.json
+
+Set BENCH_POSTGRES_URL (or pass --database-url) to include Postgres.
+The benchmark drops and recreates the tables it touches, so only point it
+at a scratch database.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from benchmarks.fixture_server import SOURCES, FixtureSite, serve
+
+SCHEMA_VERSION = 1
+
+# lower is better for these; everything else (throughput) higher is better
+_LOWER_IS_BETTER = ("_ms", "peak_rss_kb", "elapsed_s", "errors")
+
+
+@dataclass
+class StageTimes:
+    fetch: list[float] = field(default_factory=list)
+    extract: list[float] = field(default_factory=list)
+    store: list[float] = field(default_factory=list)
+    page: list[float] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {
+            name: {
+                "p50_ms": round(percentile(values, 50), 3),
+                "p99_ms": round(percentile(values, 99), 3),
+                "count": len(values),
+            }
+            for name, values in (
+                ("fetch", self.fetch),
+                ("extract", self.extract),
+                ("store", self.store),
+                ("page", self.page),
+            )
+        }
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Nearest-rank percentile; 0.0 for an empty list.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, min(len(ordered), math.ceil(q / 100.0 * len(ordered))))
+    return ordered[rank - 1]
+
+
+def peak_rss_kb() -> int:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return int(usage / 1024) if sys.platform == "darwin" else int(usage)
+
+
+def git_rev() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return ""
+
+
+def run_backend(
+    database_url: str,
+    base_url: str,
+    *,
+    pages: int,
+    throttle_delay: float,
+    profile_dir: Optional[Path] = None,
+) -> dict:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.crawling.collector import BaseCollector, FetchResult, HttpCollector
+    from app.crawling.robots import RobotsClient
+    from app.crawling.throttle import HostThrottle
+    from app.db.base import Base
+    from app.extractors.arxiv import ArxivExtractor
+    from app.extractors.base import BaseExtractor
+    from app.extractors.hackernews import HackerNewsExtractor
+    from app.extractors.wikipedia import WikipediaExtractor
+    from app.models import crawl  # noqa: F401  (populate metadata)
+    from app.schemas.crawl import CrawlRecordIn
+    from app.services.crawl_pipeline import CrawlPipeline
+    from app.services.profiling import profile_run
+
+    times = StageTimes()
+
+    class TimedCollector(BaseCollector):
+        def __init__(self, inner: BaseCollector):
+            self.inner = inner
+
+        def fetch(self, url: str, *, timeout: Optional[float] = None) -> FetchResult:
+            start = time.perf_counter()
+            try:
+                return self.inner.fetch(url, timeout=timeout)
+            finally:
+                times.fetch.append((time.perf_counter() - start) * 1000)
+
+    class TimedExtractor(BaseExtractor):
+        def __init__(self, inner: BaseExtractor):
+            self.inner = inner
+
+        def extract(self, *, source: str, url: str, html: str) -> list[CrawlRecordIn]:
+            start = time.perf_counter()
+            try:
+                return self.inner.extract(source=source, url=url, html=html)
+            finally:
+                times.extract.append((time.perf_counter() - start) * 1000)
+
+    extractors: dict[str, BaseExtractor] = {
+        "hackernews": TimedExtractor(HackerNewsExtractor()),
+        "arxiv": TimedExtractor(ArxivExtractor()),
+        "python_docs": TimedExtractor(WikipediaExtractor()),
+    }
+
+    engine = create_engine(database_url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+    user_agent = "autoforge-bench/0.1"
+    collector = TimedCollector(
+        HttpCollector(
+            user_agent=user_agent,
+            robots=RobotsClient(user_agent=user_agent, ttl_seconds=3600),
+            throttle=HostThrottle(min_delay_seconds=throttle_delay),
+        )
+    )
+
+    run_id = uuid.uuid4().hex
+    pages_ok = 0
+    records = 0
+    errors = 0
+
+    started = time.perf_counter()
+    with profile_run() if profile_dir else nullcontext() as prof, SessionLocal() as db:
+        for index in range(pages):
+            for source, prefix in SOURCES.items():
+                pipeline = CrawlPipeline(db=db, collector=collector, extractor=extractors[source])
+                fetch_before = len(times.fetch)
+                extract_before = len(times.extract)
+
+                page_start = time.perf_counter()
+                result = pipeline.run(
+                    job_id="bench",
+                    run_id=run_id,
+                    source=source,
+                    start_url=f"{base_url}/{prefix}/{index}",
+                )
+                page_ms = (time.perf_counter() - page_start) * 1000
+
+                fetch_ms = sum(times.fetch[fetch_before:])
+                extract_ms = sum(times.extract[extract_before:])
+                times.page.append(page_ms)
+                times.store.append(max(0.0, page_ms - fetch_ms - extract_ms))
+
+                if result.get("ok"):
+                    pages_ok += 1
+                    records += int(result.get("saved", 0))
+                else:
+                    errors += 1
+    elapsed = time.perf_counter() - started
+    engine.dispose()
+
+    summary = {
+        "backend": engine.dialect.name,
+        "pages": pages_ok,
+        "records": records,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "pages_per_sec": round(pages_ok / elapsed, 3) if elapsed else 0.0,
+        "records_per_sec": round(records / elapsed, 3) if elapsed else 0.0,
+        "stages": times.summary(),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+    if prof is not None:
+        path = profile_dir / f"{engine.dialect.name}.folded"
+        path.write_text(prof.folded, encoding="utf-8")
+        summary["profile"] = {
+            "folded": str(path),
+            "samples": prof.sample_count,
+            "stages": prof.stages,
+            "memory": prof.memory,
+        }
+    return summary
+
+
+def _flatten(result: dict, prefix: str = "") -> dict[str, float]:
+    flat: dict[str, float] = {}
+    for key, value in result.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = float(value)
+    return flat
+
+
+def compare(baseline: dict, current: dict) -> list[str]:
+    """
+    Human-readable per-metric deltas between two benchmark documents.
+    Positive percentages are improvements.
+    """
+    lines: list[str] = []
+    base_by_backend = {r["backend"]: r for r in baseline.get("results", [])}
+    for result in current.get("results", []):
+        base = base_by_backend.get(result["backend"])
+        if base is None:
+            continue
+        lines.append(f"[{result['backend']}] {baseline.get('git_rev', '')[:10]} -> {current.get('git_rev', '')[:10]}")
+        old = _flatten(base)
+        new = _flatten(result)
+        for name in sorted(new):
+            if name not in old or name.endswith("count"):
+                continue
+            before, after = old[name], new[name]
+            if before == 0:
+                continue
+            change = (after - before) / before * 100
+            if name.endswith(_LOWER_IS_BETTER):
+                change = -change
+            lines.append(f"  {name:<24} {before:>12.3f} -> {after:>12.3f}  ({change:+.1f}%)")
+    return lines
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="AutoForge crawl benchmark")
+    parser.add_argument("--pages", type=int, default=20, help="pages per source")
+    parser.add_argument("--items", type=int, default=30, help="items per listing page")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--disallow", action="append", default=[], help="robots.txt Disallow path (repeatable)")
+    parser.add_argument("--recorded-dir", type=Path, default=None, help="directory with hn.html/arxiv.html/docs.html")
+    parser.add_argument("--throttle-delay", type=float, default=0.0, help="HostThrottle min delay seconds")
+    parser.add_argument("--database-url", action="append", default=[], help="database URL (repeatable)")
+    parser.add_argument("--output", type=Path, default=None, help="write JSON here instead of stdout")
+    parser.add_argument("--compare", type=Path, default=None, help="baseline JSON to diff against")
+    parser.add_argument(
+        "--profile", type=Path, default=None, metavar="DIR", help="sample each run; write <backend>.folded to DIR"
+    )
+    args = parser.parse_args(argv)
+
+    if args.profile:
+        args.profile.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix="autoforge-bench-") as tmp:
+        urls = list(args.database_url) or [f"sqlite:///{tmp}/bench.db"]
+        pg_url = os.environ.get("BENCH_POSTGRES_URL")
+        if pg_url and pg_url not in urls:
+            urls.append(pg_url)
+
+        # app.core.config requires a DATABASE_URL even though the bench builds its own engines
+        os.environ.setdefault("DATABASE_URL", urls[0])
+
+        site = FixtureSite(
+            items_per_page=args.items,
+            latency_ms=args.latency_ms,
+            latency_jitter_ms=args.latency_jitter_ms,
+            disallow=args.disallow,
+            recorded_dir=args.recorded_dir,
+        )
+
+        results = []
+        with serve(site) as base_url:
+            for url in urls:
+                results.append(
+                    run_backend(
+                        url,
+                        base_url,
+                        pages=args.pages,
+                        throttle_delay=args.throttle_delay,
+                        profile_dir=args.profile,
+                    )
+                )
+
+    doc = {
+        "schema": SCHEMA_VERSION,
+        "git_rev": git_rev(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "pages_per_source": args.pages,
+            "items_per_page": args.items,
+            "latency_ms": args.latency_ms,
+            "latency_jitter_ms": args.latency_jitter_ms,
+            "disallow": args.disallow,
+            "recorded_dir": str(args.recorded_dir) if args.recorded_dir else None,
+            "throttle_delay": args.throttle_delay,
+        },
+        "results": results,
+    }
+
+    text = json.dumps(doc, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        for line in compare(baseline, doc):
+            print(line, file=sys.stderr)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
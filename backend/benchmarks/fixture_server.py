@@ -0,0 +1,151 @@
+"""
+Local fixture site for crawl benchmarks.
+
+Serves HN / arXiv / docs style pages (plus robots.txt) from a threaded
+HTTP server on 127.0.0.1 so the full pipeline can run without touching
+the real sites.
+
+Pro Tip:
+Benchmarks are only comparable when the remote side is fixed.
+Latency and robots rules are explicit knobs here, not whatever the
+internet felt like doing during the run.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator, Optional
+
+# source name -> path prefix the fixture pages are served under
+SOURCES: dict[str, str] = {
+    "hackernews": "hn",
+    "arxiv": "arxiv",
+    "python_docs": "docs",
+}
+
+
+@dataclass
+class FixtureSite:
+    """
+    Page generator for the fixture server.
+
+    If `recorded_dir` contains `hn.html`, `arxiv.html` or `docs.html`
+    those recorded pages are served verbatim for every index of that
+    source; otherwise synthetic pages shaped like the real markup are
+    generated.
+    """
+
+    items_per_page: int = 30
+    latency_ms: float = 0.0
+    latency_jitter_ms: float = 0.0
+    disallow: list[str] = field(default_factory=list)
+    recorded_dir: Optional[Path] = None
+
+    def robots_txt(self) -> str:
+        lines = ["User-agent: *"]
+        lines.extend(f"Disallow: {path}" for path in self.disallow)
+        if not self.disallow:
+            lines.append("Disallow:")
+        return "\n".join(lines) + "\n"
+
+    def page(self, prefix: str, index: int) -> Optional[str]:
+        recorded = self._recorded(prefix)
+        if recorded is not None:
+            return recorded
+
+        if prefix == "hn":
+            return self._hn_page(index)
+        if prefix == "arxiv":
+            return self._arxiv_page(index)
+        if prefix == "docs":
+            return f"<html><head><title>Python docs page {index}</title></head><body><p>docs</p></body></html>"
+        return None
+
+    def delay(self) -> None:
+        if self.latency_ms <= 0 and self.latency_jitter_ms <= 0:
+            return
+        jitter = random.uniform(0, self.latency_jitter_ms) if self.latency_jitter_ms > 0 else 0.0
+        time.sleep((self.latency_ms + jitter) / 1000.0)
+
+    def _recorded(self, prefix: str) -> Optional[str]:
+        if self.recorded_dir is None:
+            return None
+        path = self.recorded_dir / f"{prefix}.html"
+        if not path.is_file():
+            return None
+        return path.read_text(encoding="utf-8")
+
+    def _hn_page(self, index: int) -> str:
+        rows = "".join(
+            f'<tr class="athing"><td class="title"><span class="titleline">'
+            f'<a href="https://example.com/hn/{index}/{i}">Fixture story {index}-{i}</a>'
+            f"</span></td></tr>"
+            for i in range(self.items_per_page)
+        )
+        return f"<html><head><title>Hacker News</title></head><body><table>{rows}</table></body></html>"
+
+    def _arxiv_page(self, index: int) -> str:
+        rows = "".join(
+            f'<dt><a href="/abs/{index:04d}.{i:05d}">arXiv:{index:04d}.{i:05d}</a></dt>'
+            f"<dd><div class=\"list-title\">Title: Fixture paper {index}-{i}</div></dd>"
+            for i in range(self.items_per_page)
+        )
+        return f"<html><head><title>cs.AI recent</title></head><body><dl>{rows}</dl></body></html>"
+
+
+def _make_handler(site: FixtureSite) -> type[BaseHTTPRequestHandler]:
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            site.delay()
+
+            if self.path == "/robots.txt":
+                self._send(200, site.robots_txt(), "text/plain")
+                return
+
+            parts = [p for p in self.path.split("?", 1)[0].split("/") if p]
+            body = None
+            if len(parts) == 2 and parts[1].isdigit():
+                body = site.page(parts[0], int(parts[1]))
+
+            if body is None:
+                self._send(404, "not found", "text/plain")
+                return
+            self._send(200, body, "text/html")
+
+        def _send(self, status: int, body: str, content_type: str) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args) -> None:  # noqa: A002
+            # keep benchmark output clean
+            return
+
+    return FixtureHandler
+
+
+@contextmanager
+def serve(site: FixtureSite) -> Iterator[str]:
+    """
+    Run the fixture site in a background thread; yields its base URL.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(site))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        yield f"http://{host}:{port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join(timeout=5)
@@ -0,0 +1,87 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.db.base import Base
+from app.models import analytics, archive, crawl, dedup, profiles, versions, workers  # noqa: F401
+
+# Settings are read on first import of app.core.config (not done above); give module-level
+# TestClient(app) users (test_api, test_health) a throwaway database unless one is set.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='autoforge-tests-')}/app.db")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_settings_db():
+    """
+    The app no longer creates tables on startup; migrate the settings database once,
+    the way `python -m app.db.migrate` does before a deploy.
+    """
+    from app.db.migrate import migrate
+
+    migrate()
+
+
+@pytest.fixture
+def db_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'test.db'}"
+
+
+@pytest.fixture
+def db(db_url):
+    """
+    Fresh SQLite session (file-backed so the async engine can share it) with all tables created.
+    """
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def client(db, db_url):
+    """
+    TestClient with get_db / get_async_db pointed at the `db` fixture's database
+    and all response caches empty.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.api.routes import stats as stats_routes
+    from app.core.config import settings
+    from app.db.async_session import get_async_db
+    from app.db.session import get_db
+    from app.main import app
+    from app.services.response_cache import response_cache
+
+    async_engine = create_async_engine(db_url.replace("sqlite://", "sqlite+aiosqlite://"), poolclass=NullPool)
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_async_db():
+        async with AsyncSessionLocal() as session:
+            yield session
+
+    def reset_caches():
+        response_cache.store.clear()
+        response_cache.forget_versions()
+        stats_routes._cache.clear()
+
+    reset_caches()
+    validate_responses = settings.validate_responses
+    settings.validate_responses = True
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_async_db] = override_async_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+        settings.validate_responses = validate_responses
+        reset_caches()
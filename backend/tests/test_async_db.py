@@ -0,0 +1,22 @@
+from app.api.routes import crawl as crawl_routes
+from app.db.async_session import async_url
+
+
+def test_async_url_maps_sync_drivers():
+    assert async_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    assert async_url("postgresql://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
+    assert async_url("postgresql+psycopg://u:p@db/app") == "postgresql+psycopg://u:p@db/app"
+
+
+def test_run_endpoint_creates_job_via_async_session(client, monkeypatch):
+    queued = []
+    monkeypatch.setattr(crawl_routes, "_run_job_in_background", queued.append)
+
+    r = client.post("/crawl/run")
+    assert r.status_code == 200
+    job_id = r.json()["job_id"]
+    assert queued == [job_id]
+
+    jobs = client.get("/crawl/jobs").json()
+    assert jobs[0]["id"] == job_id
+    assert jobs[0]["status"] == "queued"
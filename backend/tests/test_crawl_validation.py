@@ -9,4 +9,44 @@ def test_tag_validation_kebab_case():
 
 def test_url_validation():
     with pytest.raises(ValueError):
-        CrawlRecordIn(source="x", title="t", url="ftp://example.com", tags=["ok"])
\ No newline at end of file
+        CrawlRecordIn(source="x", title="t", url="ftp://example.com", tags=["ok"])
+
+def test_validate_records_batch_shares_page_timestamp():
+    from app.schemas.crawl import validate_records
+
+    records = validate_records(
+        [
+            {"source": "x", "title": "a", "url": "https://example.com/a", "tags": ["ok"]},
+            {"source": "x", "title": "b", "url": "https://example.com/b", "fetched_at": "2024-01-01T00:00:00+00:00"},
+        ]
+    )
+    assert all(isinstance(r, CrawlRecordIn) for r in records)
+    assert records[1].fetched_at == "2024-01-01T00:00:00+00:00"
+
+    stamped = validate_records([{"source": "x", "title": str(i), "url": f"https://example.com/{i}"} for i in range(3)])
+    assert len({r.fetched_at for r in stamped}) == 1
+
+    with pytest.raises(ValueError):
+        validate_records([{"source": "x", "title": "t", "url": "https://example.com", "tags": ["Bad Tag"]}])
+
+
+def test_compute_hash_algorithms():
+    from app.services.crawl_pipeline import compute_hash
+
+    # unchanged default: existing content_hash values still match
+    assert compute_hash("x", " t ", "https://e.com ", algorithm="sha256") == (
+        "4cd0b75997f597f56a7d60a40c85c0d70fae583f3a6c32002635b7834fd95f5c"
+    )
+    digests = {compute_hash("x", "t", "https://e.com", algorithm=a) for a in ("sha256", "blake2b")}
+    assert len(digests) == 2
+    assert all(len(d) == 64 for d in digests)
+
+
+def test_record_hash_algorithm_is_validated_at_startup():
+    from pydantic import ValidationError
+
+    from app.core.config import Settings
+
+    assert Settings(database_url="sqlite://", record_hash_algorithm="blake2b").record_hash_algorithm == "blake2b"
+    with pytest.raises(ValidationError):
+        Settings(database_url="sqlite://", record_hash_algorithm="sha-256")
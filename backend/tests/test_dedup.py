@@ -0,0 +1,144 @@
+from sqlalchemy import func, select
+
+from app.crawling.collector import BaseCollector, FetchResult
+from app.crawling.validators import canonicalize_url
+from app.extractors.base import BaseExtractor
+from app.models.crawl import CrawlRecord
+from app.schemas.crawl import CrawlRecordIn
+from app.services.crawl_pipeline import CrawlPipeline
+from app.services.dedup import BANDS, DEFAULT_THRESHOLD, DedupIndex, fingerprint, jaccard, lsh_bands, title_tokens
+
+
+def test_canonicalize_url_generic_rules():
+    assert (
+        canonicalize_url("HTTP://WWW.Example.com:80/a/b/?utm_source=x&b=2&a=1&fbclid=z#frag")
+        == "https://example.com/a/b?a=1&b=2"
+    )
+    assert canonicalize_url("https://example.com/") == "https://example.com/"
+
+
+def test_canonicalize_url_keeps_invalid_ports():
+    assert canonicalize_url(" http://Example.com:abc/p ", "hackernews") == "http://Example.com:abc/p"
+
+
+def test_canonicalize_url_source_rules():
+    assert canonicalize_url("https://arxiv.org/pdf/2401.01234v2.pdf", "arxiv") == "https://arxiv.org/abs/2401.01234"
+    assert canonicalize_url("https://arxiv.org/abs/2401.01234v3?context=cs", "arxiv") == "https://arxiv.org/abs/2401.01234"
+    assert (
+        canonicalize_url("https://news.ycombinator.com/item?id=1&source=rss", "hackernews")
+        == "https://news.ycombinator.com/item?id=1"
+    )
+
+
+def test_title_similarity_survives_small_edits():
+    base = title_tokens("Google announces new quantum computing chip for error correction")
+    edits = [
+        "Google announces a new quantum computing chip for error correction",  # inserted word
+        "Google announces new quantum computing chip for error",  # dropped word
+        "Google announces new quantum computing chip for error correction (2024)",  # appended year
+        "Google unveils new quantum computing chip for error correction",  # swapped word
+    ]
+    for edited in edits:
+        tokens = title_tokens(edited)
+        assert jaccard(base, tokens) >= DEFAULT_THRESHOLD
+        assert set(lsh_bands(base)) & set(lsh_bands(tokens))
+
+    unrelated = title_tokens("Ask HN: How do you keep up with Postgres release notes")
+    assert jaccard(base, unrelated) == 0
+    assert not set(lsh_bands(base)) & set(lsh_bands(unrelated))
+    assert title_tokens("Too short") == frozenset()
+    assert lsh_bands(frozenset()) == []
+
+
+def test_lsh_bands_shape():
+    bands = lsh_bands(title_tokens("Attention is all you need, revisited for long documents"))
+    assert [band for band, _ in bands] == list(range(BANDS))
+    assert all(0 <= bucket < 2**31 for _, bucket in bands)
+    assert lsh_bands(title_tokens("attention IS all you need revisited for long documents!")) == bands
+
+
+def test_index_matches_url_and_title(db):
+    rec = CrawlRecord(
+        source="hackernews",
+        title="A tiny SQLite clone written in Rust",
+        url="https://example.com/post",
+        tags="",
+        fetched_at="2024-01-01T00:00:00+00:00",
+        content_hash="h",
+        created_at="2024-01-01T00:00:00+00:00",
+    )
+    db.add(rec)
+    db.commit()
+
+    index = DedupIndex(db)
+    fp = fingerprint("hackernews", "A tiny SQLite clone written in Rust", "https://example.com/post")
+    assert index.add(rec.id, fp) is True
+    assert index.add(rec.id, fp) is False
+
+    assert index.find_duplicate(fp) == rec.id
+    same_title = fingerprint("hackernews", "A tiny SQLite clone written in Rust", "https://example.com/other")
+    assert index.find_duplicate(same_title) == rec.id
+    other_host = fingerprint("hackernews", "A tiny SQLite clone written in Rust", "https://mirror.example.org/post")
+    assert index.find_duplicate(other_host) is None
+    other_source = fingerprint("arxiv", "A tiny SQLite clone written in Rust", "https://example.com/post")
+    assert index.find_duplicate(other_source) is None
+
+
+class _StaticCollector(BaseCollector):
+    def fetch(self, url: str) -> FetchResult:
+        return FetchResult(url=url, host="example.com", status_code=200, duration_ms=1, robots_allowed=True, text="")
+
+
+class _StaticExtractor(BaseExtractor):
+    def __init__(self, records):
+        self.records = records
+
+    def extract(self, *, source: str, url: str, html: str) -> list[CrawlRecordIn]:
+        return self.records
+
+
+def test_pipeline_merges_near_duplicates(db):
+    records = [
+        CrawlRecordIn(source="hackernews", title="A tiny SQLite clone written in Rust", url="https://example.com/p?utm_source=hn", tags=["rust"]),
+        CrawlRecordIn(source="hackernews", title="A  tiny SQLite clone written in Rust", url="http://www.example.com/p/", tags=["db"]),
+        # edited titles on other URLs: one word inserted, one dropped
+        CrawlRecordIn(source="hackernews", title="A tiny SQLite clone written in pure Rust", url="https://example.com/p2"),
+        CrawlRecordIn(source="hackernews", title="A tiny SQLite clone in Rust", url="https://example.com/p3"),
+        CrawlRecordIn(source="hackernews", title="Unrelated story about compilers", url="https://example.com/c"),
+    ]
+    pipeline = CrawlPipeline(db=db, collector=_StaticCollector(), extractor=_StaticExtractor(records))
+    result = pipeline.run(job_id="j", run_id="r", source="hackernews", start_url="https://example.com/")
+
+    assert result == {"ok": True, "saved": 5, "seen": 5, "merged": 3}
+    assert db.scalar(select(func.count()).select_from(CrawlRecord)) == 2
+    kept = db.scalar(select(CrawlRecord).order_by(CrawlRecord.id))
+    # stored as extracted; only the hash / fingerprint use the canonical form
+    assert kept.url == "https://example.com/p?utm_source=hn"
+    assert kept.tags == "rust,db"
+
+
+def test_migrate_backfills_fingerprints_for_existing_rows(db):
+    from app.db.migrate import migrate
+    from app.repositories.crawl_repo import CrawlRepository
+
+    # stored before dedup existed: raw URL, no fingerprint rows
+    old = CrawlRepository(db).upsert_record(
+        source="hackernews",
+        title="A tiny SQLite clone written in Rust",
+        url="http://www.example.com/p/",
+        tags_csv="rust",
+        fetched_at="2024-01-01T00:00:00+00:00",
+        content_hash="legacy-hash",
+    )
+    migrate(db.get_bind())
+
+    records = [
+        CrawlRecordIn(source="hackernews", title="Different title entirely here", url="https://example.com/p?ref=x", tags=["db"])
+    ]
+    pipeline = CrawlPipeline(db=db, collector=_StaticCollector(), extractor=_StaticExtractor(records))
+    result = pipeline.run(job_id="j", run_id="r", source="hackernews", start_url="https://example.com/")
+
+    assert result["merged"] == 1
+    assert db.scalar(select(func.count()).select_from(CrawlRecord)) == 1
+    db.refresh(old)
+    assert old.tags == "rust,db"
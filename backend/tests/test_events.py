@@ -0,0 +1,79 @@
+import asyncio
+import threading
+
+from app.repositories.crawl_repo import CrawlRepository
+from app.services.events import EventBroker, broker, sse_format
+
+
+def test_broker_fans_out_from_threads():
+    async def scenario():
+        local = EventBroker(queue_size=10)
+        a = local.subscribe()
+        b = local.subscribe({"job"})
+
+        def publish():
+            local.publish({"type": "job", "data": {"id": 1}})
+            local.publish({"type": "record", "data": {"id": 2}})
+
+        t = threading.Thread(target=publish)
+        t.start()
+        t.join()
+        await asyncio.sleep(0)
+
+        got_a = [a.queue.get_nowait() for _ in range(a.queue.qsize())]
+        got_b = [b.queue.get_nowait() for _ in range(b.queue.qsize())]
+        return got_a, got_b
+
+    got_a, got_b = asyncio.run(scenario())
+    assert [e["type"] for e in got_a] == ["job", "record"]
+    assert [e["type"] for e in got_b] == ["job"]
+
+
+def test_slow_subscriber_drops_oldest_and_reports_lag():
+    async def scenario():
+        local = EventBroker(queue_size=2)
+        sub = local.subscribe()
+        for i in range(5):
+            local.publish({"type": "record", "data": {"id": i}})
+        await asyncio.sleep(0)
+
+        out = []
+        stream = local.stream(sub, heartbeat_seconds=0.01)
+        async for item in stream:
+            if item is None:
+                break
+            out.append(item)
+        return out
+
+    out = asyncio.run(scenario())
+    assert out[0] == {"type": "lagged", "data": {"dropped": 3}}
+    assert [e["data"]["id"] for e in out[1:]] == [3, 4]
+
+
+def test_repository_writes_publish_after_commit(db):
+    async def scenario():
+        sub = broker.subscribe()
+        try:
+            repo = CrawlRepository(db)
+            repo.job_run_start(job_id="crawl_sampler", run_id="r1", started_at="2024-01-01T00:00:00+00:00")
+            repo.upsert_record(
+                source="hackernews",
+                title="t",
+                url="https://example.com/t",
+                tags_csv="",
+                fetched_at="2024-01-01T00:00:00+00:00",
+                content_hash="h",
+            )
+            await asyncio.sleep(0)
+            return [sub.queue.get_nowait() for _ in range(sub.queue.qsize())]
+        finally:
+            broker.unsubscribe(sub)
+
+    events = asyncio.run(scenario())
+    assert [e["type"] for e in events] == ["job", "record"]
+    assert events[0]["data"]["status"] == "started"
+    assert events[1]["data"]["created"] is True
+
+
+def test_sse_format():
+    assert sse_format({"type": "job", "data": {"id": 1}}) == b'event: job\ndata: {"id":1}\n\n'
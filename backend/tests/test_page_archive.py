@@ -0,0 +1,57 @@
+from sqlalchemy import func, select
+
+from app.crawling.collector import BaseCollector, FetchResult
+from app.extractors.hackernews import HackerNewsExtractor
+from app.models.archive import ArchivedPage
+from app.models.crawl import CrawlRecord
+from app.models.dedup import RecordFingerprint, RecordTitleBand
+from app.services.crawl_pipeline import CrawlPipeline
+from app.services.page_archive import PageArchive
+from app.services.reprocess import reprocess
+
+HN_HTML = """
+<html><body><table>
+<tr class="athing"><td><span class="titleline"><a href="https://example.com/a">Compilers for everyone, a primer</a></span></td></tr>
+<tr class="athing"><td><span class="titleline"><a href="https://example.com/b">Why SQLite is everywhere today</a></span></td></tr>
+</table></body></html>
+"""
+
+
+class _StaticCollector(BaseCollector):
+    def __init__(self, html):
+        self.html = html
+
+    def fetch(self, url: str) -> FetchResult:
+        return FetchResult(url=url, host="news.ycombinator.com", status_code=200, duration_ms=1, robots_allowed=True, text=self.html)
+
+
+def test_archive_is_content_addressed(tmp_path):
+    archive = PageArchive(tmp_path)
+    first = archive.put(b"<html>same</html>" * 100)
+    again = archive.put(b"<html>same</html>" * 100)
+
+    assert first.created and not again.created
+    assert first.body_hash == again.body_hash
+    assert first.stored_bytes < first.size_bytes
+    assert archive.get(first.body_hash) == b"<html>same</html>" * 100
+    assert len(list(tmp_path.rglob("*.zst"))) == 1
+
+
+def test_pipeline_archives_and_reprocess_reextracts(db, tmp_path):
+    archive = PageArchive(tmp_path)
+    for run in ("r1", "r2"):
+        pipeline = CrawlPipeline(db=db, collector=_StaticCollector(HN_HTML), extractor=HackerNewsExtractor(), archive=archive)
+        assert pipeline.run(job_id="j", run_id=run, source="hackernews", start_url="https://news.ycombinator.com/")["ok"]
+
+    # same body twice -> one index row, one file
+    assert db.scalar(select(func.count()).select_from(ArchivedPage)) == 1
+    assert len(list(tmp_path.rglob("*.zst"))) == 1
+
+    for model in (RecordTitleBand, RecordFingerprint, CrawlRecord):
+        db.query(model).delete()
+    db.commit()
+
+    totals = reprocess(db, archive, source="hackernews", workers=2)
+    assert totals == {"pages": 1, "failed": 0, "seen": 2, "saved": 2, "merged": 0}
+    titles = db.scalars(select(CrawlRecord.title).order_by(CrawlRecord.title)).all()
+    assert titles == ["Compilers for everyone, a primer", "Why SQLite is everywhere today"]
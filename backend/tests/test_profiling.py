@@ -0,0 +1,64 @@
+import json
+import time
+
+from app.repositories.crawl_repo import CrawlRepository
+from app.services.profiling import classify, folded, profile_run
+
+
+def _busy_parse(deadline):
+    from bs4 import BeautifulSoup
+
+    while time.perf_counter() < deadline:
+        BeautifulSoup("<p>" + "<b>x</b>" * 200 + "</p>", "html.parser")
+
+
+def test_profile_run_samples_and_attributes_stages():
+    with profile_run(interval=0.001) as prof:
+        _busy_parse(time.perf_counter() + 0.2)
+        blob = [bytearray(1024) for _ in range(500)]  # noqa: F841 (kept alive for tracemalloc)
+
+    assert prof.sample_count > 10
+    assert prof.stages["parse"]["share"] > 0.5
+    assert prof.memory["peak_kb"] >= 500
+    first = prof.folded.splitlines()[0]
+    stack, count = first.rsplit(" ", 1)
+    assert int(count) >= 1
+    assert any(frame.endswith("test_profiling:_busy_parse") for frame in stack.split(";"))
+
+
+def test_classify_prefers_outer_stage():
+    stack = ("app.crawling.robots:RobotsClient.can_fetch", "urllib.robotparser:RobotFileParser.read", "socket:recv")
+    assert classify(stack) == "robots"
+    assert classify(("app.services.crawl_pipeline:ingest_records", "sqlalchemy.orm.session:Session.commit")) == "database"
+    assert classify(("builtins:foo",)) == "other"
+
+
+def test_folded_format():
+    from collections import Counter
+
+    assert folded(Counter({("a", "b"): 3, ("a",): 1})) == "a;b 3\na 1\n"
+
+
+def test_profile_endpoint(client, db):
+    assert client.get("/crawl/runs/missing/profile").status_code == 404
+
+    CrawlRepository(db).save_profile(
+        job_id="crawl_sampler",
+        run_id="abc123",
+        created_at="2024-01-01T00:00:00+00:00",
+        duration_ms=42,
+        interval_ms=5,
+        sample_count=2,
+        folded="main;crawl 2\n",
+        stages=json.dumps({"network": {"samples": 2, "approx_ms": 10.0, "share": 1.0}}),
+        memory=json.dumps({"peak_kb": 1}),
+    )
+
+    r = client.get("/crawl/runs/abc123/profile")
+    assert r.status_code == 200
+    assert r.text == "main;crawl 2\n"
+    assert r.headers["content-type"].startswith("text/plain")
+
+    summary = client.get("/crawl/runs/abc123/profile", params={"format": "json"}).json()
+    assert summary["stages"]["network"]["samples"] == 2
+    assert summary["duration_ms"] == 42
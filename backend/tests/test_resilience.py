@@ -0,0 +1,180 @@
+import httpx
+import pytest
+from sqlalchemy import func, select, text
+
+from app.crawling.collector import BaseCollector, CrawlBlockedByRobots, FetchResult
+from app.crawling.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpen,
+    FetchFailed,
+    ResilientCollector,
+    RetryPolicy,
+)
+from app.db.migrations import add_missing_columns
+from app.extractors.hackernews import HackerNewsExtractor
+from app.models.crawl import CrawlRecord, CrawlRequestLog, JobRun
+from app.services.crawl_pipeline import CrawlPipeline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class ScriptedCollector(BaseCollector):
+    """Returns / raises the scripted outcomes in order; records the timeouts it was given."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.timeouts = []
+
+    def fetch(self, url, *, timeout=None):
+        self.timeouts.append(timeout)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FetchResult(url=url, host="example.com", status_code=outcome, duration_ms=1, robots_allowed=True, text="")
+
+
+def _collector(inner, clock, breaker=None, **kw):
+    return ResilientCollector(
+        inner,
+        breaker=breaker or CircuitBreaker(clock=clock),
+        policy=RetryPolicy(max_attempts=3, base_delay_seconds=1.0, max_delay_seconds=4.0),
+        clock=clock,
+        sleep=clock.sleep,
+        rng=lambda: 1.0,
+        **kw,
+    )
+
+
+def test_retries_transient_errors_then_succeeds():
+    clock = FakeClock()
+    inner = ScriptedCollector(httpx.ConnectTimeout("slow"), 503, 200)
+    result = _collector(inner, clock).fetch("https://example.com/")
+
+    assert result.status_code == 200
+    assert result.attempts == 3
+    assert result.breaker_state == CLOSED
+    assert clock.now == 1.0 + 2.0  # exponential backoff
+
+
+def test_gives_up_and_does_not_retry_4xx():
+    clock = FakeClock()
+    with pytest.raises(FetchFailed) as exc:
+        _collector(ScriptedCollector(*[httpx.ConnectError("down")] * 3), clock).fetch("https://example.com/")
+    assert exc.value.attempts == 3
+    assert exc.value.error_type == "ConnectError"
+
+    inner = ScriptedCollector(404)
+    assert _collector(inner, FakeClock()).fetch("https://example.com/").attempts == 1
+
+
+def test_run_budget_caps_timeouts_and_retries():
+    clock = FakeClock()
+    inner = ScriptedCollector(httpx.ReadTimeout("t"), 200)
+    collector = _collector(inner, clock, request_timeout_seconds=15.0, run_budget_seconds=10.0)
+    collector.fetch("https://example.com/")
+    assert inner.timeouts == [10.0, 9.0]
+
+    clock.now = 11.0
+    with pytest.raises(FetchFailed) as exc:
+        collector.fetch("https://example.com/")
+    assert exc.value.error_type == "RunBudgetExhausted"
+
+
+def test_breaker_opens_then_half_opens():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, min_samples=2, window=4, cooldown_seconds=60, clock=clock)
+    for _ in range(2):
+        breaker.record("h", ok=False)
+    assert breaker.state("h") == OPEN
+    assert not breaker.allow("h")
+
+    clock.now += 61
+    assert breaker.state("h") == HALF_OPEN
+    assert breaker.allow("h")
+    assert not breaker.allow("h")  # one trial at a time
+    breaker.record("h", ok=True)
+    assert breaker.state("h") == CLOSED
+
+
+def test_half_open_trial_is_released_on_non_transport_errors():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, min_samples=2, window=4, cooldown_seconds=60, clock=clock)
+    for _ in range(2):
+        breaker.record("example.com", ok=False)
+    clock.now += 61
+
+    # robots block during the trial: no outcome, the host stays half-open for the next trial
+    blocked = _collector(ScriptedCollector(CrawlBlockedByRobots("disallowed")), clock, breaker=breaker)
+    with pytest.raises(CrawlBlockedByRobots):
+        blocked.fetch("https://example.com/a")
+    assert breaker.state("example.com") == HALF_OPEN
+
+    # a non-retryable request error fails the trial and re-opens the breaker
+    redirects = _collector(ScriptedCollector(httpx.TooManyRedirects("loop")), clock, breaker=breaker)
+    with pytest.raises(httpx.TooManyRedirects):
+        redirects.fetch("https://example.com/a")
+    assert breaker.state("example.com") == OPEN
+    with pytest.raises(CircuitOpen):
+        redirects.fetch("https://example.com/a")
+
+    clock.now += 61
+    assert breaker.allow("example.com")
+
+
+def test_pipeline_logs_attempts_and_breaker_state(db):
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, min_samples=1, cooldown_seconds=60, clock=clock)
+    collector = _collector(ScriptedCollector(*[httpx.ConnectError("down")] * 3), clock, breaker=breaker)
+    pipeline = CrawlPipeline(db=db, collector=collector, extractor=HackerNewsExtractor())
+
+    assert pipeline.run(job_id="j", run_id="r1", source="hackernews", start_url="https://example.com/")["ok"] is False
+    assert pipeline.run(job_id="j", run_id="r2", source="hackernews", start_url="https://example.com/")["ok"] is False
+
+    rows = db.scalars(select(CrawlRequestLog).order_by(CrawlRequestLog.id)).all()
+    assert [(r.error_type, r.attempts, r.breaker_state) for r in rows] == [
+        ("ConnectError", 3, OPEN),
+        ("CircuitOpen", 0, OPEN),
+    ]
+
+
+def test_pipeline_fails_when_retries_end_on_an_error_status(db):
+    clock = FakeClock()
+    collector = _collector(ScriptedCollector(503, 503, 503), clock)
+    pipeline = CrawlPipeline(db=db, collector=collector, extractor=HackerNewsExtractor())
+
+    result = pipeline.run(job_id="j", run_id="r1", source="hackernews", start_url="https://example.com/")
+    assert result == {"ok": False, "error": "exception"}
+
+    # the error page is neither extracted nor reported as a successful run
+    assert db.scalar(select(func.count()).select_from(CrawlRecord)) == 0
+    assert db.scalar(select(JobRun.status).where(JobRun.run_id == "r1")) == "failed"
+    log = db.scalar(select(CrawlRequestLog))
+    assert (log.error_type, log.status_code, log.attempts) == ("HTTP503", 503, 3)
+
+
+def test_add_missing_columns_upgrades_old_table(db):
+    db.execute(text("DROP TABLE crawl_requests"))
+    db.execute(text("CREATE TABLE crawl_requests (id INTEGER PRIMARY KEY, url VARCHAR(2048))"))
+    # a non-empty table: SQLite rejects ADD COLUMN with a non-constant default there
+    db.execute(text("INSERT INTO crawl_requests (url) VALUES ('https://example.com/')"))
+    db.commit()
+
+    conn = db.connection()
+    assert add_missing_columns(conn) == [
+        "crawl_requests.attempts",
+        "crawl_requests.breaker_state",
+        "crawl_requests.inserted_at",
+    ]
+    assert add_missing_columns(conn) == []
@@ -0,0 +1,118 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.cache import RedisCache, TTLCache
+from app.models.versions import DataVersion
+from app.repositories.crawl_repo import CrawlRepository
+from app.services.response_cache import response_cache
+
+
+class FakeRedis:
+    """Local stand-in for a redis client (get / set(ex=) / scan_iter / delete)."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        return [k for k in list(self.data) if k.startswith(prefix)]
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _add_record(db, title):
+    repo = CrawlRepository(db)
+    repo.upsert_record(
+        source="hackernews",
+        title=title,
+        url=f"https://example.com/{title}",
+        tags_csv="tech",
+        fetched_at="2024-01-01T00:00:00+00:00",
+        content_hash=title,
+    )
+    repo.mark_records_changed()
+
+
+def test_ttl_cache_lru_eviction():
+    cache = TTLCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_redis_cache_with_stand_in_client():
+    fake = FakeRedis()
+    cache = RedisCache(30, client=fake, prefix="t:")
+    assert cache.get_or_set("k", lambda: b"body") == b"body"
+    assert cache.get("k") == b"body"
+    cache.clear()
+    assert fake.data == {}
+
+
+def test_records_etag_and_304(client, db):
+    _add_record(db, "first")
+
+    r1 = client.get("/crawl/records")
+    assert r1.status_code == 200
+    assert r1.json() == [
+        {
+            "id": 1,
+            "source": "hackernews",
+            "title": "first",
+            "url": "https://example.com/first",
+            "tags": ["tech"],
+            "fetched_at": "2024-01-01T00:00:00+00:00",
+            "content_hash": "first",
+        }
+    ]
+    etag = r1.headers["etag"]
+
+    r2 = client.get("/crawl/records", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+
+
+def test_write_invalidates_cached_listing(client, db):
+    _add_record(db, "first")
+    etag = client.get("/crawl/records").headers["etag"]
+
+    _add_record(db, "second")
+    response_cache.forget_versions()
+
+    r = client.get("/crawl/records", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert [row["title"] for row in r.json()] == ["second", "first"]
+    assert r.headers["etag"] != etag
+
+
+def test_jobs_version_bumped_by_job_writes(client, db):
+    before = client.get("/crawl/jobs").headers["etag"]
+
+    CrawlRepository(db).job_run_start(job_id="crawl_sampler", run_id="r1", started_at="2024-01-01T00:00:00+00:00")
+    response_cache.forget_versions()
+
+    r = client.get("/crawl/jobs", headers={"If-None-Match": before})
+    assert r.status_code == 200
+    assert r.json()[0]["status"] == "started"
+
+
+def test_version_bump_is_a_single_upsert(db):
+    # two writers on a fresh database: the first bump inserts the row, the second increments it
+    for _ in range(2):
+        with Session(db.get_bind()) as writer:
+            CrawlRepository(writer).bump_version("records")
+            # written in SQL, not queued as an ORM insert that a concurrent bump could collide with
+            assert not writer.new
+            writer.commit()
+    assert db.scalar(select(DataVersion.version).where(DataVersion.name == "records")) == 2
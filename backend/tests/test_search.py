@@ -0,0 +1,69 @@
+from app.repositories.crawl_repo import CrawlRepository
+
+
+def _add(db, title, *, source="hackernews", tags="", n=0):
+    repo = CrawlRepository(db)
+    repo.upsert_record(
+        source=source,
+        title=title,
+        url=f"https://example.com/{n}",
+        tags_csv=tags,
+        fetched_at="2024-01-01T00:00:00+00:00",
+        content_hash=f"h{n}",
+    )
+    repo.mark_records_changed()
+
+
+def _ids(resp):
+    return [r["id"] for r in resp.json()["items"]]
+
+
+def test_search_prefix_tags_and_source(client, db):
+    _add(db, "Python asyncio deep dive", tags="python", n=1)
+    _add(db, "Rust ownership explained", tags="rust", n=2)
+    _add(db, "Faster Python startup", source="python_docs", n=3)
+
+    assert set(_ids(client.get("/crawl/records/search", params={"q": "pyth"}))) == {1, 3}
+    assert _ids(client.get("/crawl/records/search", params={"q": "pyth asyn"})) == [1]
+    assert _ids(client.get("/crawl/records/search", params={"q": "rust"})) == [2]
+    assert _ids(client.get("/crawl/records/search", params={"q": "python", "source": "python_docs"})) == [3]
+    # operators / quotes are stripped, not passed to the query parser
+    assert client.get("/crawl/records/search", params={"q": '"NEAR( -'}).json() == {"items": [], "next_cursor": None}
+
+
+def test_search_index_follows_updates(client, db):
+    _add(db, "Original headline here", n=1)
+    _add(db, "Renamed headline here", n=1)  # same content_hash -> update
+
+    assert _ids(client.get("/crawl/records/search", params={"q": "original"})) == []
+    assert _ids(client.get("/crawl/records/search", params={"q": "renamed"})) == [1]
+
+
+def test_search_cursor_pagination(client, db):
+    for n in range(1, 6):
+        _add(db, f"Postgres tip number {n}", n=n)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": "postgres", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        body = client.get("/crawl/records/search", params=params).json()
+        seen += [r["id"] for r in body["items"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+
+    assert sorted(seen) == [1, 2, 3, 4, 5]
+    assert len(seen) == 5
+    assert client.get("/crawl/records/search", params={"q": "x", "cursor": "%%%"}).status_code == 400
+
+
+def test_listing_source_and_before_id(client, db):
+    _add(db, "a", n=1)
+    _add(db, "b", source="arxiv", n=2)
+    _add(db, "c", n=3)
+
+    assert [r["id"] for r in client.get("/crawl/records", params={"source": "hackernews"}).json()] == [3, 1]
+    assert [r["id"] for r in client.get("/crawl/records", params={"before_id": 3}).json()] == [2, 1]
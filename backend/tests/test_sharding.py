@@ -0,0 +1,104 @@
+from datetime import datetime, timedelta, timezone
+
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy.orm import sessionmaker
+
+from app.crawling.sharding import HashRing, ShardCoordinator, shard_key
+from app.crawling.sources import SourceRegistry
+from app.scheduler.runner import sync_source_jobs
+
+HOSTS = [f"site{i}.example.org" for i in range(400)]
+
+SOURCES = """
+sources:
+  - name: hn_front
+    url: https://news.ycombinator.com/
+    extractor: hackernews
+  - name: hn_new
+    url: https://www.news.ycombinator.com/newest
+    extractor: hackernews
+  - name: arxiv
+    url: https://arxiv.org/list/cs.AI/recent
+    extractor: arxiv
+  - name: python_docs
+    url: https://docs.python.org/3/
+    extractor: wikipedia
+"""
+
+
+class Clock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+    def __call__(self):
+        return self.now
+
+
+def test_shard_key_ignores_scheme_www_and_port():
+    assert shard_key("https://WWW.Example.org:8443/a?b=1") == "example.org"
+    assert shard_key("http://example.org/") == "example.org"
+
+
+def test_ring_spreads_hosts_and_moves_few_on_join():
+    three = HashRing(["a", "b", "c"])
+    owners = {host: three.owner(host) for host in HOSTS}
+    counts = {node: list(owners.values()).count(node) for node in "abc"}
+    assert min(counts.values()) > len(HOSTS) / 3 * 0.5
+
+    four = HashRing(["a", "b", "c", "d"])
+    moved = [host for host in HOSTS if four.owner(host) != owners[host]]
+    # only hosts taken over by the new node move
+    assert all(four.owner(host) == "d" for host in moved)
+    assert len(moved) < len(HOSTS) / 2
+
+
+def test_coordinators_split_hosts_and_rebalance(db):
+    factory = sessionmaker(bind=db.get_bind(), autoflush=False, autocommit=False)
+    clock = Clock()
+    a = ShardCoordinator(factory, node_id="worker-a", ttl_seconds=30, now=clock)
+    b = ShardCoordinator(factory, node_id="worker-b", ttl_seconds=30, now=clock)
+
+    assert a.heartbeat() is True
+    assert b.heartbeat() is True
+    assert a.heartbeat() is True  # a learns about b
+    assert a.members == b.members == {"worker-a", "worker-b"}
+
+    urls = [f"https://{host}/" for host in HOSTS]
+    for url in urls:
+        assert a.owns(url) != b.owns(url)
+    assert any(a.owns(url) for url in urls) and any(b.owns(url) for url in urls)
+
+    # b stops heartbeating: once past the TTL, a takes every host
+    clock.now += timedelta(seconds=31)
+    assert a.heartbeat() is True
+    assert all(a.owns(url) for url in urls)
+
+    # b comes back, then leaves gracefully
+    b.heartbeat()
+    a.heartbeat()
+    assert a.members == {"worker-a", "worker-b"}
+    b.leave()
+    assert a.heartbeat() is True
+    assert a.members == {"worker-a"}
+
+
+def test_sync_source_jobs_keeps_only_owned_hosts(db, tmp_path):
+    path = tmp_path / "sources.yaml"
+    path.write_text(SOURCES, encoding="utf-8")
+    registry = SourceRegistry(path)
+    factory = sessionmaker(bind=db.get_bind(), autoflush=False, autocommit=False)
+    clock = Clock()
+    workers = [ShardCoordinator(factory, node_id=f"worker-{i}", now=clock) for i in range(3)]
+    for worker in workers + workers:
+        worker.heartbeat()
+
+    scheduled = []
+    for worker in workers:
+        scheduler = BackgroundScheduler(timezone="UTC")
+        sync_source_jobs(scheduler, registry, shard=worker)
+        scheduled.append({job.id for job in scheduler.get_jobs()})
+
+    # every source runs on exactly one worker, and both HN sources share one
+    all_jobs = [job for jobs in scheduled for job in jobs]
+    assert sorted(all_jobs) == sorted(f"crawl:{s.name}" for s in registry.sources())
+    assert any({"crawl:hn_front", "crawl:hn_new"} <= jobs for jobs in scheduled)
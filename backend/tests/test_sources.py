@@ -0,0 +1,104 @@
+import os
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.crawling.sources import DEFAULT_SOURCES_FILE, SourceRegistry
+from app.extractors.hackernews import HackerNewsExtractor
+from app.scheduler.runner import sync_source_jobs
+
+ONE_SOURCE = """
+sources:
+  - name: hackernews
+    url: https://news.ycombinator.com/
+    extractor: hackernews
+    schedule: "*/5 * * * *"
+    selectors:
+      link: "a.storylink"
+"""
+
+TWO_SOURCES = ONE_SOURCE + """
+  - name: arxiv
+    url: https://arxiv.org/list/cs.AI/recent
+    extractor: arxiv
+    concurrency: 2
+"""
+
+
+def _write(path, body, mtime):
+    path.write_text(body, encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))  # explicit mtimes: filesystem timestamps can be coarse
+
+
+def test_default_sources_file_is_valid():
+    names = [s.name for s in SourceRegistry(DEFAULT_SOURCES_FILE).sources()]
+    assert names == ["python_docs", "hackernews", "arxiv"]
+
+
+def test_hot_reload_keeps_last_good_config(tmp_path):
+    path = tmp_path / "sources.yaml"
+    _write(path, ONE_SOURCE, 1_000_000_000)
+    registry = SourceRegistry(path)
+    assert [s.name for s in registry.sources()] == ["hackernews"]
+    assert registry.reload_if_changed() is False
+
+    _write(path, TWO_SOURCES, 2_000_000_000)
+    assert [s.name for s in registry.sources()] == ["hackernews", "arxiv"]
+
+    _write(path, TWO_SOURCES.replace("extractor: arxiv", "extractor: nope"), 3_000_000_000)
+    assert [s.name for s in registry.sources()] == ["hackernews", "arxiv"]
+    assert registry.version == 2
+
+
+def test_extractors_are_cached_with_selector_overrides(tmp_path):
+    path = tmp_path / "sources.yaml"
+    _write(path, ONE_SOURCE, 1_000_000_000)
+    source = SourceRegistry(path).get("hackernews")
+
+    extractor = SourceRegistry.extractor_for(source)
+    assert extractor is SourceRegistry.extractor_for(source)
+    assert isinstance(extractor, HackerNewsExtractor)
+
+    html = '<a class="storylink" href="https://example.com/x">Custom markup story</a>'
+    records = extractor.extract(source="hackernews", url="https://news.ycombinator.com/", html=html)
+    assert [r.url for r in records] == ["https://example.com/x"]
+
+
+def test_sync_source_jobs_follows_registry(tmp_path):
+    path = tmp_path / "sources.yaml"
+    _write(path, TWO_SOURCES, 1_000_000_000)
+    registry = SourceRegistry(path)
+    scheduler = BackgroundScheduler(timezone="UTC")
+
+    sync_source_jobs(scheduler, registry)
+    jobs = {j.id: j for j in scheduler.get_jobs()}
+    assert set(jobs) == {"crawl:hackernews", "crawl:arxiv"}
+    assert jobs["crawl:arxiv"].max_instances == 2
+
+    _write(path, ONE_SOURCE, 2_000_000_000)
+    sync_source_jobs(scheduler, registry)
+    assert [j.id for j in scheduler.get_jobs()] == ["crawl:hackernews"]
+
+
+def test_sources_on_one_host_share_a_throttle(tmp_path, monkeypatch):
+    from app.scheduler import jobs
+
+    path = tmp_path / "sources.yaml"
+    _write(
+        path,
+        TWO_SOURCES
+        + """
+  - name: hn_new
+    url: https://www.news.ycombinator.com/newest
+    extractor: hackernews
+    min_delay_seconds: 5
+""",
+        1_000_000_000,
+    )
+    registry = SourceRegistry(path)
+    monkeypatch.setattr(jobs, "registry", registry)
+    monkeypatch.setattr(jobs, "_throttles", {})
+
+    front, newest, arxiv = (jobs._throttle_for(registry.get(n)) for n in ("hackernews", "hn_new", "arxiv"))
+    assert front is newest
+    assert front.min_delay_seconds == 5  # strictest delay configured for the host
+    assert arxiv is not front
@@ -0,0 +1,66 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Crawler / analytics / optional-extra dependencies the API must not load until a route needs them
+API_LAZY_MODULES = [
+    "app.scheduler.jobs",
+    "app.extractors",
+    "apscheduler",
+    "bs4",
+    "httpx",
+    "lxml",
+    "pandas",
+    "pyarrow",
+    "soupsieve",
+    "yaml",
+    "zstandard",
+]
+# A cold `import app.main` is well under a second; this only catches large regressions.
+API_IMPORT_BUDGET_SECONDS = 5.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def _cold_import(module: str, tmp_path) -> dict:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp_path / 'startup.db'}"}
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def test_api_import_stays_lean(tmp_path):
+    probe = _cold_import("app.main", tmp_path)
+    loaded = set(probe["modules"])
+
+    assert [m for m in API_LAZY_MODULES if m in loaded] == []
+    assert probe["seconds"] < API_IMPORT_BUDGET_SECONDS
+
+
+def test_api_import_does_not_touch_the_database(tmp_path):
+    _cold_import("app.main", tmp_path)
+
+    # schema setup is `python -m app.db.migrate`, not an import / startup side effect
+    assert not (tmp_path / "startup.db").exists()
+
+
+def test_worker_import_skips_analytics(tmp_path):
+    loaded = set(_cold_import("app.scheduler.runner", tmp_path)["modules"])
+
+    assert not {"pandas", "pyarrow"} & loaded
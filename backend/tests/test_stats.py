@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.models.analytics import HostLatencyStat
+from app.repositories.crawl_repo import CrawlRepository
+from app.services.rollups import refresh_all
+
+
+def _seed(db):
+    repo = CrawlRepository(db)
+    now = datetime.now(timezone.utc).isoformat()
+    for i, duration in enumerate([10, 20, 30, 40, 500]):
+        repo.log_request(
+            job_id="crawl_sampler",
+            run_id=f"r{i}",
+            method="GET",
+            url="https://example.com/",
+            host="example.com",
+            robots_allowed=True,
+            status_code=200,
+            duration_ms=duration,
+            created_at=now,
+        )
+    repo.log_request(
+        job_id="crawl_sampler",
+        run_id="r9",
+        method="GET",
+        url="https://example.com/",
+        host="example.com",
+        robots_allowed=True,
+        status_code=0,
+        duration_ms=0,
+        error_type="ConnectTimeout",
+        created_at=now,
+    )
+    repo.job_run_start(job_id="crawl_sampler", run_id="a", started_at=now)
+    repo.job_run_finish(job_id="crawl_sampler", run_id="a", status="success", finished_at=now)
+    repo.job_run_start(job_id="crawl_sampler", run_id="b", started_at=now)
+    repo.job_run_finish(job_id="crawl_sampler", run_id="b", status="failed", finished_at=now)
+    repo.job_run_start(job_id="crawl_sampler", run_id="c", started_at=now)
+    repo.upsert_record(
+        source="hackernews",
+        title="t",
+        url="https://example.com/t",
+        tags_csv="",
+        fetched_at=now,
+        content_hash="h",
+    )
+
+
+def test_refresh_rollups(db):
+    _seed(db)
+    assert refresh_all(db) == {"hosts": 1, "jobs": 1}
+
+
+def test_refresh_upserts_and_drops_stale_rows(db):
+    _seed(db)
+    db.add(HostLatencyStat(host="gone.example.com", refreshed_at="2020-01-01T00:00:00+00:00"))
+    db.commit()
+
+    # overlapping refreshes (several workers / a manual run) update rows in place
+    assert refresh_all(db) == {"hosts": 1, "jobs": 1}
+    assert refresh_all(db) == {"hosts": 1, "jobs": 1}
+    assert db.scalars(select(HostLatencyStat.host)).all() == ["example.com"]
+
+
+def test_stats_endpoints(client, db):
+    _seed(db)
+    refresh_all(db)
+
+    hosts = client.get("/crawl/stats/hosts").json()
+    assert hosts[0]["host"] == "example.com"
+    assert hosts[0]["samples"] == 5
+    assert hosts[0]["errors"] == 1
+    assert hosts[0]["p50_ms"] == 30
+    assert hosts[0]["p99_ms"] == 500
+
+    jobs = client.get("/crawl/stats/jobs").json()
+    assert jobs == [
+        {
+            "job_id": "crawl_sampler",
+            "total": 3,
+            "succeeded": 1,
+            "failed": 1,
+            "in_progress": 1,
+            "success_rate": 0.5,
+            "last_finished_at": jobs[0]["last_finished_at"],
+            "refreshed_at": jobs[0]["refreshed_at"],
+        }
+    ]
+
+    sources = client.get("/crawl/stats/sources").json()
+    assert sources["totals"] == {"hackernews": 1}
+    assert sources["buckets"][0]["count"] == 1
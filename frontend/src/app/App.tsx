@@ -7,6 +7,7 @@ import {
   getHealth,
   getJobs,
   runCrawlNow,
+  subscribeCrawlEvents,
   type CrawlRecord,
   type JobRun,
 } from "./api";
@@ -120,6 +121,24 @@ export default function App() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, []);
 
+  // Live updates: refetch when the backend reports job / record changes
+  useEffect(() => {
+    let recordsTimer: number | null = null;
+    const unsubscribe = subscribeCrawlEvents((e) => {
+      if (e.type === "job" || e.type === "lagged") void loadJobs();
+      if (e.type === "record" || e.type === "lagged") {
+        // a crawl upserts many records at once; coalesce into one refetch
+        if (recordsTimer) window.clearTimeout(recordsTimer);
+        recordsTimer = window.setTimeout(() => void loadRecords(), 500);
+      }
+    });
+    return () => {
+      if (recordsTimer) window.clearTimeout(recordsTimer);
+      unsubscribe();
+    };
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [limit]);
+
   // Auto-refresh interval wiring
   useEffect(() => {
     if (intervalRef.current) {
@@ -60,4 +60,20 @@ export async function getJobs(limit: number = 20): Promise<JobRun[]> {
     const base = getApiBaseUrl();
     const safe = Math.max(1, Math.min(limit, 100));
     return fetchJson<JobRun[]>(`${base}/crawl/jobs?limit=${safe}`);
-}
\ No newline at end of file
+}
+export type CrawlEvent = {
+    type: "job" | "record" | "lagged" | string;
+    data: Record<string, unknown>;
+};
+
+// Server-sent events; returns an unsubscribe function.
+export function subscribeCrawlEvents(onEvent: (e: CrawlEvent) => void): () => void {
+    const base = getApiBaseUrl();
+    const source = new EventSource(`${base}/crawl/events`);
+    for (const type of ["job", "record", "lagged"]) {
+        source.addEventListener(type, (msg) => {
+            onEvent({ type, data: JSON.parse((msg as MessageEvent).data) });
+        });
+    }
+    return () => source.close();
+}
@@ -22,4 +22,13 @@ def backend_format(session: nox.Session) -> None:
 @nox.session
 def backend_types(session: nox.Session) -> None:
     session.install("-e", "./backend[dev]")
-    session.run("pyright", "backend/app")
\ No newline at end of file
+    session.run("pyright", "backend/app")
+
+
+@nox.session
+def backend_bench(session: nox.Session) -> None:
+    # e.g. nox -s backend_bench -- --pages 50 --output ../bench.json
+    # set BENCH_POSTGRES_URL to a scratch database to include Postgres
+    session.install("-e", "./backend[dev]")
+    session.chdir("backend")
+    session.run("python", "-m", "benchmarks.crawl_bench", *session.posargs)